@@ -0,0 +1,203 @@
+import argparse
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from model.CsvCache import CsvCache
+from model.SamplingEngine import SamplingEngine
+from model.Signal import Signal
+
+FIELDS = [
+    "file",
+    "column",
+    "sampling_freq",
+    "samples",
+    "rmse",
+    "max_error",
+    "snr_db",
+]
+
+
+def collect_files(paths: list) -> list:
+    """
+    Expands the given files and directories into a sorted list of CSV files
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(
+                    os.path.join(root, name)
+                    for name in names
+                    if name.lower().endswith(".csv")
+                )
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+def resolve_column(channels: list, name: str) -> str:
+    """
+    Finds a channel by its exact name or ignoring surrounding whitespace
+    """
+    if name in channels:
+        return name
+    for channel in channels:
+        if channel.strip() == name.strip():
+            return channel
+    raise KeyError(f"column {name!r} not found, available: {channels}")
+
+
+def evaluate_file(
+    file_path: str,
+    columns: list,
+    rates: list,
+    nyquist_multiples: list,
+    offset: int,
+    length: int,
+    mode: str,
+    cache_dir: str = None,
+    write_cache: bool = True,
+) -> list:
+    """
+    Samples and reconstructs every requested column of a file at every rate.
+
+    Returns:
+        list: One dict of FIELDS per (column, rate).
+
+    The Nyquist multiples are relative to the Nyquist rate 2 * fmax, where fmax is
+    half the recording's sampling frequency. The recording is read through a
+    CsvCache in cache_dir (by default the shared one), which only stores new
+    entries when write_cache is set.
+    """
+    rows = []
+    engine = SamplingEngine()
+    base = Signal()
+    base.csv_cache = CsvCache(cache_dir, writable=write_cache)
+    base.read_data_from_csv(file_path, offset=offset, length=length)
+    for name in columns:
+        sig = base.store.signal(resolve_column(base.store.channels, name))
+        sig.set_reconstruction_mode(mode)
+        sampling_freqs = list(rates) + [m * 2 * sig.fmax for m in nyquist_multiples]
+        # the process pool already uses every core, so each file is swept on one thread
+        sweep = engine.sweep(sig, sampling_freqs, workers=1)
+        signal_power = np.mean(np.square(sig.y))
+        for i, sampling_freq in enumerate(sweep["rates"]):
+            error_power = sweep["rmse"][i] ** 2
+            rows.append(
+                {
+                    "file": file_path,
+                    "column": sig.channel.strip(),
+                    "sampling_freq": sampling_freq,
+                    "samples": sweep["samples"][i],
+                    "rmse": sweep["rmse"][i],
+                    "max_error": sweep["max_error"][i],
+                    "snr_db": 10 * np.log10(signal_power / error_power)
+                    if error_power > 0
+                    else float("inf"),
+                }
+            )
+    return rows
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Sample and reconstruct CSV recordings without the GUI, "
+        "writing the reconstruction error of every (file, column, rate) to a table."
+    )
+    parser.add_argument("paths", nargs="+", help="CSV files or directories of CSV files")
+    parser.add_argument(
+        "--columns", nargs="+", default=["II"], help="the columns to evaluate (default: II)"
+    )
+    parser.add_argument(
+        "--rates", nargs="*", type=float, default=[], help="sampling frequencies in Hz"
+    )
+    parser.add_argument(
+        "--nyquist",
+        nargs="*",
+        type=float,
+        default=[],
+        help="sampling frequencies as multiples of the Nyquist rate 2 * fmax",
+    )
+    parser.add_argument(
+        "--offset", type=int, default=0, help="the first row of each recording to use"
+    )
+    parser.add_argument(
+        "--length",
+        type=int,
+        default=None,
+        help="the number of rows to use (default: the whole recording)",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=Signal.RECONSTRUCTION_MODES,
+        default="windowed",
+        help="the reconstruction engine (default: windowed)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="the directory of the binary CSV cache "
+        "(default: $SAMPLING_STUDIO_CACHE or ~/.cache/sampling-studio)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="never write a recording to the CSV cache, which holds a float64 copy of each one",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="the number of worker processes (default: the CPU count)",
+    )
+    parser.add_argument(
+        "--output", "-o", default="-", help="the output CSV table (default: stdout)"
+    )
+    args = parser.parse_args(argv)
+    if not args.rates and not args.nyquist:
+        parser.error("give at least one of --rates or --nyquist")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    files = collect_files(args.paths)
+    output = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    writer = csv.DictWriter(output, fieldnames=FIELDS)
+    writer.writeheader()
+    failures = 0
+    try:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            futures = {
+                pool.submit(
+                    evaluate_file,
+                    file_path,
+                    args.columns,
+                    args.rates,
+                    args.nyquist,
+                    args.offset,
+                    args.length,
+                    args.mode,
+                    args.cache_dir,
+                    not args.no_cache,
+                ): file_path
+                for file_path in files
+            }
+            for future in as_completed(futures):
+                try:
+                    writer.writerows(future.result())
+                except Exception as error:
+                    failures += 1
+                    print(f"{futures[future]}: {error}", file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
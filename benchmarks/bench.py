@@ -0,0 +1,279 @@
+"""
+Benchmarks of the sampling and reconstruction hot paths.
+
+Every case is run over a grid of signal lengths and sampling frequencies and
+timed with a warm-up run followed by `--repeat` measured runs. Results are
+written as JSON (one record per case and parameter set, with the machine and
+git revision) so that runs can be compared over time:
+
+    python benchmarks/bench.py                      # run everything
+    python benchmarks/bench.py -k reconstruct       # run matching cases only
+    python benchmarks/bench.py --compare old.json new.json
+
+The draw_signal case needs PyQt6 and runs offscreen.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+
+from model.Component import Component
+from model.CsvCache import CsvCache
+from model.Signal import Signal
+
+DATA = os.path.join(ROOT, "data", "bidmc_01_Signals.csv")
+LENGTHS = [1000, 10000, 60000]
+RATES = [25, 62.5, 250]
+
+CASES = {}
+
+
+def case(name: str, params: list):
+    """
+    Registers a benchmark. The function takes the parameters and returns a zero-argument callable to time,
+    or a (callable, cleanup) pair whose cleanup is called once the case has been timed.
+    """
+
+    def register(function):
+        CASES[name] = (function, params)
+        return function
+
+    return register
+
+
+def recording(length: int) -> Signal:
+    sig = Signal()
+    sig.read_data_from_csv(DATA, length=length)
+    return sig
+
+
+def grid(lengths=LENGTHS, rates=RATES, limit=None) -> list:
+    """
+    Returns the (length, rate) grid, dropping combinations above `limit` length * samples
+    """
+    params = []
+    for length in lengths:
+        for rate in rates:
+            samples = length / 125 * rate
+            if limit is None or length * samples <= limit:
+                params.append({"length": length, "rate": rate})
+    return params
+
+
+@case("reconstruct_exact", grid(limit=1e8))
+def bench_reconstruct_exact(length, rate):
+    sig = recording(length)
+    x_values, y_values = sig.sample(rate)
+    return lambda: sig.whittaker_shannon_interpolation(sig.x, y_values, x_values, 1 / rate)
+
+
+@case("reconstruct_windowed", grid())
+def bench_reconstruct_windowed(length, rate):
+    sig = recording(length)
+    x_values, y_values = sig.sample(rate)
+    return lambda: sig.windowed_sinc_interpolation(sig.x, y_values, x_values, 1 / rate)
+
+
+@case("reconstruct_fft", grid())
+def bench_reconstruct_fft(length, rate):
+    sig = recording(length)
+    x_values, y_values = sig.sample(rate)
+    return lambda: sig.spectral_interpolation(sig.x, y_values, x_values, 1 / rate)
+
+
+@case("reconstruct_windowed_cached", grid())
+def bench_reconstruct_windowed_cached(length, rate):
+    sig = recording(length)
+    x_values, y_values = sig.sample(rate)
+    sig.reconstruct(sig.x, y_values, x_values, 1 / rate)
+    return lambda: sig.reconstruct(sig.x, y_values, x_values, 1 / rate)
+
+
+@case("sample_signal", grid())
+def bench_sample_signal(length, rate):
+    sig = recording(length)
+    sig.new_sampling_freq = rate
+    return sig.sample_signal
+
+
+@case("add_component", [{"components": n} for n in (1, 10, 100, 1000)])
+def bench_add_component(components):
+    rng = np.random.default_rng(0)
+    params = rng.uniform([0.1, 0.1, 0], [2, 20, 2], size=(components, 3))
+
+    def synthesize():
+        sig = Signal()
+        sig.add_components([Component(*p) for p in params])
+
+    return synthesize
+
+
+@case("add_component_arrays", [{"components": n} for n in (1000, 10000)])
+def bench_add_component_arrays(components):
+    rng = np.random.default_rng(0)
+    params = rng.uniform([0.1, 0.1, 0], [2, 20, 2], size=(components, 3))
+
+    def synthesize():
+        sig = Signal()
+        sig.add_component_arrays(params[:, 0], params[:, 1], params[:, 2])
+
+    return synthesize
+
+
+@case("apply_noise", [{"length": n} for n in LENGTHS])
+def bench_apply_noise(length):
+    sig = recording(length)
+    return lambda: sig.change_snr(10.0)
+
+
+@case("load_csv", [{"length": n, "cache": c} for n in (1000, None) for c in ("cold", "warm")])
+def bench_load_csv(length, cache):
+    directory = tempfile.mkdtemp(prefix="sampling-studio-bench-")
+    warm = CsvCache(directory)
+    # the first read fills the cache the way an upload does
+    first = Signal()
+    first.csv_cache = warm
+    first.read_data_from_csv(DATA, length=length)
+
+    def load():
+        sig = Signal()
+        # a fresh directory per run keeps the cold case from hitting any cache
+        sig.csv_cache = warm if cache == "warm" else CsvCache(tempfile.mkdtemp(dir=directory))
+        sig.read_data_from_csv(DATA, length=length)
+
+    return load, lambda: shutil.rmtree(directory, ignore_errors=True)
+
+
+@case("draw_signal", grid(lengths=[1000, 10000], rates=[25, 250]))
+def bench_draw_signal(length, rate):
+    from PyQt6.QtWidgets import QApplication
+
+    from model.SamplingHandler import SamplingHandler
+
+    app = QApplication.instance() or QApplication([])
+    handler = SamplingHandler(dark_mode=False)
+    sig = recording(length)
+    handler.add_signal(sig)
+    handler.change_sampling_freq(rate, sig)
+
+    def draw():
+        handler.cache.clear()
+        handler.render_signal(sig, handler.compute_signal(sig))
+        for channel in handler.channels:
+            channel.grab()
+        app.processEvents()
+
+    return draw
+
+
+def run_case(function, params: dict, repeat: int) -> dict:
+    run = function(**params)
+    cleanup = None
+    if isinstance(run, tuple):
+        run, cleanup = run
+    try:
+        run()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+    finally:
+        if cleanup is not None:
+            cleanup()
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "repeat": repeat,
+    }
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """
+    Prints the median time of every case present in both result files and the speed-up
+    """
+    with open(old_path) as f:
+        old = {(r["case"], json.dumps(r["params"], sort_keys=True)): r for r in json.load(f)["results"]}
+    with open(new_path) as f:
+        new = json.load(f)["results"]
+    for result in new:
+        key = (result["case"], json.dumps(result["params"], sort_keys=True))
+        if key in old:
+            before, after = old[key]["median"], result["median"]
+            print(
+                f"{result['case']:22} {key[1]:40} "
+                f"{before * 1e3:10.3f} ms -> {after * 1e3:10.3f} ms  x{before / after:6.2f}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-k", dest="pattern", default="", help="only run cases containing this text")
+    parser.add_argument("--repeat", type=int, default=5, help="measured runs per case (default: 5)")
+    parser.add_argument(
+        "--output",
+        "-o",
+        default=None,
+        help="the JSON results file (default: benchmarks/results/<timestamp>.json)",
+    )
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    results = []
+    for name, (function, param_grid) in CASES.items():
+        if args.pattern not in name:
+            continue
+        for params in param_grid:
+            timing = run_case(function, params, args.repeat)
+            results.append({"case": name, "params": params, **timing})
+            print(f"{name:22} {json.dumps(params):40} {timing['median'] * 1e3:10.3f} ms")
+
+    report = {"metadata": metadata(), "results": results}
+    output = args.output
+    if output is None:
+        stamp = report["metadata"]["timestamp"].replace(":", "-")
+        output = os.path.join(ROOT, "benchmarks", "results", f"{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Checks that windowed-sinc reconstruction stays within its documented error bound.
+
+Random sums of sinusoids are sampled at several oversampling ratios and
+reconstructed with both windows, then compared at every point at least K
+samples inside the ends. The windowed result must be within
+sum|A| * E(K, r) of the true signal, and within that plus the truncation
+bound of the exact sum of `Signal.whittaker_shannon_interpolation` (see
+WindowedSinc). Exits with status 1 if any bound is exceeded, so it can gate
+CI:
+
+    python benchmarks/error_bound.py
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.Signal import Signal
+from model.WindowedSinc import WindowedSinc
+
+OVERSAMPLING = (1.25, 1.5, 2.0, 4.0)
+SAMPLES = 400
+COMPONENTS = 8
+POINTS_PER_SAMPLE = 8
+
+
+def check(window: str, oversampling: float, rng) -> tuple:
+    """
+    Returns the largest errors against the true signal and the exact sum, each as a fraction of its bound
+    """
+    fmax = 1.0
+    fs = 2 * oversampling * fmax
+    T = 1 / fs
+    amplitude = rng.uniform(-1, 1, COMPONENTS)
+    frequency = rng.uniform(0, fmax, COMPONENTS)
+    frequency[0] = fmax
+    phase = rng.uniform(0, 2 * np.pi, COMPONENTS)
+
+    def tones(t):
+        return amplitude @ np.sin(2 * np.pi * np.multiply.outer(frequency, t) + phase[:, None])
+
+    samples_x = np.arange(SAMPLES) * T
+    samples_y = tones(samples_x)
+    sig = Signal()
+    sig.interpolator = WindowedSinc(16, window)
+    K = sig.interpolator.half_width
+    x = np.linspace(K * T, (SAMPLES - 1 - K) * T, (SAMPLES - 2 * K) * POINTS_PER_SAMPLE)
+
+    windowed = sig.windowed_sinc_interpolation(x, samples_y, samples_x, T)
+    exact = sig.whittaker_shannon_interpolation(x, samples_y, samples_x, T)
+    scale = np.sum(np.abs(amplitude))
+    bound = scale * sig.interpolator.error_bound(oversampling)
+    u = x / T
+    truncation = scale / (np.pi * np.cos(np.pi / (2 * oversampling))) * (
+        1 / (u + 1) + 1 / (SAMPLES - u)
+    )
+    true_ratio = np.max(np.abs(windowed - tones(x)) / bound)
+    exact_ratio = np.max(np.abs(windowed - exact) / (bound + truncation))
+    return true_ratio, exact_ratio
+
+
+def main() -> int:
+    rng = np.random.default_rng(0)
+    failures = 0
+    for window in WindowedSinc.WINDOWS:
+        for oversampling in OVERSAMPLING:
+            worst_true, worst_exact = 0.0, 0.0
+            for _ in range(20):
+                true_ratio, exact_ratio = check(window, oversampling, rng)
+                worst_true = max(worst_true, true_ratio)
+                worst_exact = max(worst_exact, exact_ratio)
+            ok = worst_true <= 1 and worst_exact <= 1
+            failures += not ok
+            status = "ok" if ok else "FAIL"
+            print(
+                f"{status:4} {window:8} r={oversampling:<5} "
+                f"error/bound: true {worst_true:.3f}, exact {worst_exact:.3f}"
+            )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Checks that the entry points import within their time budget.
+
+Each module is imported in a fresh interpreter a few times and the fastest
+run is compared with its budget. The compute core must also not pull in
+pandas or any Qt module at import time, since those are only needed once a
+CSV is parsed or a window is shown, and reading a recording that is
+already in the binary CSV cache must not load pandas either. Exits with
+status 1 if any check fails, so it can gate CI:
+
+    python benchmarks/import_budget.py
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module: (budget in seconds, modules that must not be loaded by the import)
+BUDGETS = {
+    "model.Signal": (0.3, ["pandas", "PyQt6", "pyqtgraph"]),
+    "model.SamplingEngine": (0.3, ["pandas", "PyQt6", "pyqtgraph"]),
+    "batch": (0.35, ["pandas", "PyQt6", "pyqtgraph"]),
+    "main": (1.5, ["pandas"]),
+}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+CACHED_READ = """
+import sys
+from model.Signal import Signal
+Signal().read_data_from_csv("data/bidmc_01_Signals.csv")
+print("pandas" in sys.modules)
+"""
+
+
+def measure(module: str, runs: int = 5) -> dict:
+    """
+    Returns the fastest import time of a module and the modules it loaded
+    """
+    best = None
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module)],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+
+def cached_read_loads_pandas() -> bool:
+    """
+    Returns whether reading a recording that is already in the binary cache imports pandas
+    """
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, SAMPLING_STUDIO_CACHE=cache_dir)
+        # the first read fills the cache, the second one is measured
+        for _ in range(2):
+            output = subprocess.run(
+                [sys.executable, "-c", CACHED_READ],
+                cwd=ROOT,
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+    return output.strip().splitlines()[-1] == "True"
+
+
+def main() -> int:
+    failures = 0
+    for module, (budget, forbidden) in BUDGETS.items():
+        result = measure(module)
+        loaded = [
+            name
+            for name in forbidden
+            if any(m == name or m.startswith(name + ".") for m in result["modules"])
+        ]
+        ok = result["seconds"] <= budget and not loaded
+        failures += not ok
+        status = "ok" if ok else "FAIL"
+        detail = f" (loaded {', '.join(loaded)})" if loaded else ""
+        print(f"{status:4} {module:24} {result['seconds']:.3f}s / {budget:.2f}s{detail}")
+    loaded = cached_read_loads_pandas()
+    failures += loaded
+    print(f"{'FAIL' if loaded else 'ok':4} {'cached CSV read':24} {'loaded pandas' if loaded else 'no pandas'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
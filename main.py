@@ -1,13 +1,28 @@
 import os
-from PyQt6.QtWidgets import QApplication, QMainWindow, QFileDialog, QVBoxLayout, QWidget
-from PyQt6.QtGui import QDoubleValidator
+from PyQt6.QtWidgets import (
+    QApplication,
+    QComboBox,
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QMainWindow,
+    QMessageBox,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QDoubleValidator, QFont, QKeySequence, QShortcut
 
 from view.ComponentItem import ComponentItem
 from view.SignalItem import SignalItem
 from view.Icon import Icon
 
 from model.Component import Component
+from model.Profiler import PROFILER
 from model.SamplingHandler import SamplingHandler
+from model.SessionFile import SessionFile
 from model.Signal import Signal
 
 from view.mainwindow import Ui_MainWindow
@@ -54,6 +69,41 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.samplingFrequencySlider.setSingleStep(1)
         self.samplingFrequencySlider.setEnabled(False)
 
+        # the part of a recording to load, below the upload button; no length loads to the end
+        self.windowLayout = QHBoxLayout()
+        self.windowStartValue = QLineEdit("0")
+        self.windowLengthValue = QLineEdit()
+        self.windowLengthValue.setPlaceholderText("all")
+        self.windowLayout.addWidget(QLabel("Start (s):"))
+        self.windowLayout.addWidget(self.windowStartValue)
+        self.windowLayout.addWidget(QLabel("Length (s):"))
+        self.windowLayout.addWidget(self.windowLengthValue)
+        self.verticalLayout_3.insertLayout(
+            self.verticalLayout_3.indexOf(self.uploadSignalLayOut) + 1, self.windowLayout
+        )
+
+        # add a lead selector for multi-channel recordings above the noise controls
+        self.leadLayout = QHBoxLayout()
+        self.leadLabel = QLabel("Lead:")
+        self.leadComboBox = QComboBox()
+        self.leadComboBox.setEnabled(False)
+        self.leadLayout.addWidget(self.leadLabel)
+        self.leadLayout.addWidget(self.leadComboBox)
+        self.samplingControlLayout.insertLayout(0, self.leadLayout)
+        self.leadComboBox.currentTextChanged.connect(self.handleChangeLead)
+
+        # the duration and grid density of synthesized signals, above the add signal button
+        self.gridLayout = QHBoxLayout()
+        self.durationValue = QLineEdit("20")
+        self.oversamplingValue = QLineEdit("10")
+        self.gridLayout.addWidget(QLabel("Duration (s):"))
+        self.gridLayout.addWidget(self.durationValue)
+        self.gridLayout.addWidget(QLabel("Oversampling:"))
+        self.gridLayout.addWidget(self.oversamplingValue)
+        self.verticalLayout_2.insertLayout(
+            self.verticalLayout_2.indexOf(self.horizontalLayout_7), self.gridLayout
+        )
+
         # create a sampling handler
         self.handler = SamplingHandler(dark_mode=self.isDarkMode())
 
@@ -65,6 +115,30 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.reconstructedSignalGraphFrame.layout().addWidget(self.handler.channels[1])
         self.reconstructionErrorGraphFrame.layout().addWidget(self.handler.channels[2])
 
+        # add the error-vs-sampling-frequency plot below the graphs, shown after a sweep
+        self.verticalLayout_7.addWidget(self.handler.sweep_channel)
+        self.handler.sweep_channel.hide()
+        self.sweepButton = QPushButton("Sweep Sampling Frequency")
+        self.sweepButton.setEnabled(False)
+        self.verticalLayout_5.addWidget(self.sweepButton)
+        self.sweepButton.clicked.connect(self.handleSweep)
+
+        # the frequencies the components of a synthesized signal fold to at the sampling frequency
+        self.aliasLabel = QLabel()
+        self.aliasLabel.setWordWrap(True)
+        self.verticalLayout_5.addWidget(self.aliasLabel)
+
+        # save and reopen every signal together with its computed results
+        self.sessionLayout = QHBoxLayout()
+        self.saveSessionButton = QPushButton("Save Session")
+        self.openSessionButton = QPushButton("Open Session")
+        self.sessionLayout.addWidget(self.saveSessionButton)
+        self.sessionLayout.addWidget(self.openSessionButton)
+        self.verticalLayout_5.addLayout(self.sessionLayout)
+        self.saveSessionButton.clicked.connect(self.handleSaveSession)
+        self.openSessionButton.clicked.connect(self.handleOpenSession)
+        self.signalItems = {}
+
         # connect the nyquist rate slider to the handleChangeRate function
         self.nyquistRateSlider.valueChanged.connect(self.handleChangeNyquistRate)
         self.samplingFrequencySlider.valueChanged.connect(
@@ -76,6 +150,17 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.handleChangeSignalToNoiseRatio
         )
 
+        # stage timings overlay: F12 toggles it, Ctrl+Shift+T saves the timings as JSON
+        self.profilerLabel = QLabel()
+        self.profilerLabel.setFont(QFont("monospace", 9))
+        self.profilerLabel.hide()
+        self.verticalLayout_7.insertWidget(0, self.profilerLabel)
+        self.profilerTimer = QTimer(self)
+        self.profilerTimer.setInterval(500)
+        self.profilerTimer.timeout.connect(self.updateProfilerOverlay)
+        QShortcut(QKeySequence("F12"), self).activated.connect(self.toggleProfilerOverlay)
+        QShortcut(QKeySequence("Ctrl+Shift+T"), self).activated.connect(self.handleDumpTimings)
+
         self.componentInputType()
 
     def handleAddComponent(self, isEditing, componentItem):
@@ -146,29 +231,54 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             return
 
         newSignal = Signal()
+        newSignal.set_grid(
+            duration=self.fieldValue(self.durationValue, 20.0),
+            oversampling=self.fieldValue(self.oversamplingValue, 10.0),
+        )
+        components = []
         for compItem in self.currentComponents:
             currComponent = Component(
                 float(compItem.getAmplitude()),
                 float(compItem.getFrequency()),
                 float(compItem.getShift()),
             )
-            newSignal.add_component(currComponent)
+            components.append(currComponent)
             compItem.hide()
-            self.currentComponents = []
+        newSignal.add_components(components)
+        self.currentComponents = []
+        self.handler.change_sampling_freq(2 * newSignal.fmax, newSignal)
+        self.addSignalItem(f"Signal {len(self.currentSignals) + 1}", newSignal)
 
-        newSignalItem = SignalItem(f"Signal {len(self.currentSignals) + 1}")
+    def fieldValue(self, field, default):
+        """
+        Returns the value of a numeric field, or puts the default back into the
+        field and returns it while the text is not an acceptable value (such as 0 or "-").
+        A default of None leaves the field empty.
+        """
+        if field.hasAcceptableInput():
+            value, ok = field.validator().locale().toDouble(field.text())
+            if ok:
+                return value
+        field.setText("" if default is None else f"{default:g}")
+        return default
+
+    def addSignalItem(self, name, signal):
+        """
+        Adds a signal to the handler and its item to the signal list
+        """
+        newSignalItem = SignalItem(name)
         newSignalItem.showButton.clicked.connect(
-            lambda: self.handleShowSignal(newSignalItem, newSignal)
+            lambda: self.handleShowSignal(newSignalItem, signal)
         )
         newSignalItem.deleteButton.clicked.connect(
-            lambda: self.handleDeleteSignal(newSignalItem, newSignal)
+            lambda: self.handleDeleteSignal(newSignalItem, signal)
         )
         self.signalsScrollAreaContents.layout().insertWidget(0, newSignalItem)
         self.currentSignals.append(newSignalItem)
-        self.handler.add_signal(newSignal)
-        self.handler.change_sampling_freq(2 * newSignal.fmax, newSignal)
+        self.signalItems[newSignalItem] = signal
+        self.handler.add_signal(signal)
         if len(self.currentSignals) == 1:
-            self.handleShowSignal(newSignalItem, newSignal)
+            self.handleShowSignal(newSignalItem, signal)
 
     def handleShowSignal(self, signalItem, signal):
         """
@@ -184,16 +294,25 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         signalItem.showButton.setIcon(hideIcon)
         signalItem.showButton.setEnabled(True)
         self.currentSignal = signal
+        self.leadComboBox.blockSignals(True)
+        self.leadComboBox.clear()
+        if signal.store is not None:
+            self.leadComboBox.addItems(signal.store.channels)
+            self.leadComboBox.setCurrentText(signal.channel)
+        self.leadComboBox.setEnabled(signal.store is not None)
+        self.leadComboBox.blockSignals(False)
         self.handler.draw_signal(signal)
         self.minimumFsValue.setText("0")
         self.maximumFsValue.setText(str(int(4 * signal.fmax)))
         self.noiseCheckBox.setEnabled(True)
+        self.sweepButton.setEnabled(True)
         self.nyquistRateSlider.setEnabled(True)
         self.samplingFrequencySlider.setEnabled(True)
         self.samplingFrequencySlider.setMinimum(1)
         self.samplingFrequencySlider.setMaximum(int(4 * signal.fmax))
         self.samplingFrequencySlider.setValue(int(signal.new_sampling_freq))
         self.signalToNoiseRatioSlider.setValue(50)
+        self.updateAliasLabel()
 
     def handleDeleteSignal(self, signalItem, signal):
         """
@@ -201,10 +320,11 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """
         signalItem.hide()
         self.currentSignals.remove(signalItem)
+        del self.signalItems[signalItem]
         self.handler.delete_signal(signal)
         if signal == self.currentSignal:
-            for channel in self.handler.channels:
-                channel.clear()
+            self.handler.clear_channels()
+            self.aliasLabel.clear()
 
     def handleUploadFile(self):
         """
@@ -213,24 +333,72 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         file = QFileDialog.getOpenFileName(
             self, "Open file", ".\\", "CSV files (*.csv)"
         )
-        if file:
+        if file[0]:
             newSignal = Signal()
-            newSignal.read_data_from_csv(file[0])
-            self.handler.add_signal(newSignal)
-            signalName = os.path.splitext(os.path.basename(file[0]))[0]
-            newSignalItem = SignalItem(signalName)
-            newSignalItem.showButton.clicked.connect(
-                lambda: self.handleShowSignal(newSignalItem, newSignal)
-            )
-            newSignalItem.deleteButton.clicked.connect(
-                lambda: self.handleDeleteSignal(newSignalItem, newSignal)
-            )
-            self.signalsScrollAreaContents.layout().insertWidget(0, newSignalItem)
-            self.currentSignals.append(newSignalItem)
-            self.handler.add_signal(newSignal)
+            try:
+                newSignal.read_data_from_csv(
+                    file[0],
+                    length=None,
+                    start_time=self.fieldValue(self.windowStartValue, 0.0),
+                    duration=self.fieldValue(self.windowLengthValue, None),
+                )
+            except ValueError as error:
+                QMessageBox.warning(self, "Upload", str(error))
+                return
             self.handler.change_sampling_freq(2 * newSignal.fmax, newSignal)
-            if len(self.currentSignals) == 1:
-                self.handleShowSignal(newSignalItem, newSignal)
+            signalName = os.path.splitext(os.path.basename(file[0]))[0]
+            self.addSignalItem(signalName, newSignal)
+
+    def handleSaveSession(self):
+        """
+        Saves every signal and its computed results to a session file
+        """
+        file = QFileDialog.getSaveFileName(
+            self, "Save session", "session.sss", "Sampling Studio sessions (*.sss)"
+        )
+        if file[0]:
+            items = self.currentSignals
+            try:
+                SessionFile(file[0]).save(
+                    [self.signalItems[item] for item in items],
+                    [item.title for item in items],
+                    self.handler.cache,
+                )
+            except OSError as error:
+                QMessageBox.warning(self, "Save Session", f"Could not save the session: {error}")
+
+    def handleOpenSession(self):
+        """
+        Adds the signals of a session file, with their saved results, to the signal list
+        """
+        file = QFileDialog.getOpenFileName(
+            self, "Open session", ".\\", "Sampling Studio sessions (*.sss)"
+        )
+        if file[0]:
+            try:
+                signals = SessionFile(file[0]).load(self.handler.cache)
+            except (OSError, ValueError) as error:
+                QMessageBox.warning(self, "Open Session", f"Could not open the session: {error}")
+                return
+            for name, signal in signals:
+                self.addSignalItem(name, signal)
+
+    def handleSweep(self):
+        """
+        Plots the reconstruction error over the whole sampling frequency range
+        """
+        if self.currentSignal is not None:
+            self.handler.draw_sweep(self.currentSignal)
+
+    def handleChangeLead(self, lead):
+        """
+        Switches the current recording to another lead of the same file
+        """
+        signal = self.currentSignal
+        if signal is None or signal.store is None or lead == "":
+            return
+        signal.select_channel(lead)
+        self.handler.draw_signal(signal)
 
     def handleChangeNyquistRate(self):
         """
@@ -239,9 +407,14 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         signal = self.currentSignal
         newValue = self.nyquistRateSlider.value()
         self.nyquistRateValue.setNum(newValue)
+        # keep the other slider in sync without triggering a second redraw
+        self.samplingFrequencySlider.blockSignals(True)
         self.samplingFrequencySlider.setValue(int(newValue * signal.fmax))
+        self.samplingFrequencySlider.blockSignals(False)
+        self.samplingFreqencyValue.setNum(self.samplingFrequencySlider.value())
         self.handler.change_nq_rate(newValue, signal)
         self.handler.draw_signal(signal)
+        self.updateAliasLabel()
 
     def handleChangeSamplingFrequency(self):
         """
@@ -250,10 +423,34 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         signal = self.currentSignal
         newValue = self.samplingFrequencySlider.value()
         self.samplingFreqencyValue.setNum(newValue)
+        # keep the other slider in sync without triggering a second redraw
+        self.nyquistRateSlider.blockSignals(True)
         self.nyquistRateSlider.setValue(int(newValue / signal.fmax))
+        self.nyquistRateSlider.blockSignals(False)
         self.nyquistRateValue.setNum(round(newValue / signal.fmax))
         self.handler.change_sampling_freq(newValue, signal)
         self.handler.draw_signal(signal)
+        self.updateAliasLabel()
+
+    def updateAliasLabel(self):
+        """
+        Lists the frequencies the current signal's components alias to at its sampling frequency
+        """
+        signal = self.currentSignal
+        aliases = self.handler.alias_frequencies(signal) if signal else []
+        if not aliases:
+            self.aliasLabel.clear()
+            return
+        folded = [
+            f"{frequency:g} Hz \u2192 {alias:g} Hz"
+            for frequency, alias in aliases
+            if not abs(frequency - alias) < 1e-9
+        ]
+        fs = f"{signal.new_sampling_freq:g} Hz"
+        if folded:
+            self.aliasLabel.setText(f"Aliases at {fs}: " + ", ".join(folded))
+        else:
+            self.aliasLabel.setText(f"No aliasing at {fs}")
 
     def handleChangeSignalToNoiseRatio(self):
         """
@@ -282,15 +479,49 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.signalToNoiseRatioSlider.setValue(50)
         self.signalToNoiseRatioSlider.setEnabled(False)
         if self.currentSignal:
-            self.currentSignal.change_snr(10000)
+            self.currentSignal.clear_noise()
+            self.handler.draw_signal(self.currentSignal)
+
+    def toggleProfilerOverlay(self):
+        """
+        Shows or hides the stage timings, recording them only while shown
+        """
+        visible = self.profilerLabel.isHidden()
+        PROFILER.set_enabled(visible)
+        self.profilerLabel.setVisible(visible)
+        if visible:
+            self.updateProfilerOverlay()
+            self.profilerTimer.start()
+        else:
+            self.profilerTimer.stop()
+
+    def updateProfilerOverlay(self):
+        """
+        Refreshes the stage timings overlay, in milliseconds
+        """
+        self.profilerLabel.setText(PROFILER.format())
+
+    def handleDumpTimings(self):
+        """
+        Saves the recorded stage timings to a JSON file
+        """
+        file = QFileDialog.getSaveFileName(
+            self, "Save timings", "timings.json", "JSON files (*.json)"
+        )
+        if file[0]:
+            PROFILER.dump(file[0])
 
     def componentInputType(self):
         """
-        Limit the input of the amplitude, frequency and shift to only numbers
+        Limit the input of the amplitude, frequency, shift, grid and window fields to only numbers
         """
         self.amplitudeValue.setValidator(QDoubleValidator())
         self.frequencyValue.setValidator(QDoubleValidator())
         self.shiftValue.setValidator(QDoubleValidator())
+        self.durationValue.setValidator(QDoubleValidator(0.1, 1e5, 3))
+        self.oversamplingValue.setValidator(QDoubleValidator(2, 1e3, 3))
+        self.windowStartValue.setValidator(QDoubleValidator(0, 1e7, 3))
+        self.windowLengthValue.setValidator(QDoubleValidator(0.01, 1e7, 3))
 
     def isDarkMode(self):
         """
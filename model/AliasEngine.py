@@ -0,0 +1,69 @@
+import numpy as np
+
+from model.ComponentBank import ComponentBank
+
+
+class AliasEngine:
+    """
+    Closed-form sampling and reconstruction of sums of sinusoids.
+
+    Sampling A * sin(2 * pi * f * t + phi) at t_n = t0 + n / fs gives the
+    same samples as a sinusoid at the folded frequency r = f mod fs, or at
+    fs - r (with the sign of the sine flipped) when r is above fs / 2. The
+    ideal band-limited reconstruction of those samples is that folded
+    sinusoid, so a signal built from components is sampled by evaluating
+    the components at the instants and reconstructed by evaluating the
+    folded components on the grid, in O(N * components), with no sinc
+    kernel. A component exactly at fs / 2 only keeps the cosine part its
+    samples can show.
+
+    This is the reconstruction from an infinite train of samples, so it has
+    none of the edge effects of the finite sums used for recordings.
+    """
+
+    def fold(self, bank: ComponentBank, fs: float, t0: float = 0) -> ComponentBank:
+        """
+        Returns the components that the samples of `bank` at t0 + n / fs are indistinguishable from,
+        all at frequencies in [0, fs / 2]
+        """
+        amplitude = bank.amplitude.copy()
+        frequency = bank.frequency.copy()
+        phase = np.pi * bank.shift
+        cycles = np.floor(frequency / fs)
+        folded = frequency - cycles * fs
+        # the whole cycles of fs cost a fixed phase at the first instant
+        phase = phase + 2 * np.pi * cycles * fs * t0
+
+        upper = folded > fs / 2
+        folded[upper] = fs - folded[upper]
+        amplitude[upper] = -amplitude[upper]
+        phase[upper] = -(phase[upper] + 2 * np.pi * fs * t0)
+
+        # at fs / 2 the samples alternate in sign, so only the cosine through them is left
+        nyquist = np.isclose(folded, fs / 2)
+        amplitude[nyquist] *= np.sin(np.pi * fs * t0 + phase[nyquist])
+        phase[nyquist] = np.pi / 2 - np.pi * fs * t0
+
+        aliases = ComponentBank(max(len(bank), 1))
+        aliases.add(amplitude, folded, phase / np.pi)
+        return aliases
+
+    def sample(self, bank: ComponentBank, t) -> np.ndarray:
+        """
+        Returns the exact values of the components at the instants t
+        """
+        return bank.evaluate(t)
+
+    def reconstruct(self, bank: ComponentBank, fs: float, x, t0: float = 0) -> np.ndarray:
+        """
+        Returns the ideal reconstruction on x of the components sampled at t0 + n / fs
+        """
+        return self.fold(bank, fs, t0).evaluate(x)
+
+    def aliases(self, bank: ComponentBank, fs: float) -> list:
+        """
+        Returns the (frequency, alias frequency) pair of every distinct component frequency
+        """
+        frequencies = np.unique(bank.frequency)
+        folded = np.abs(frequencies - fs * np.round(frequencies / fs))
+        return list(zip(frequencies.tolist(), folded.tolist()))
@@ -1,7 +1,30 @@
+import numpy as np
 import pyqtgraph as pg
 
+from model.MinMaxPyramid import MinMaxPyramid
+from model.Profiler import PROFILER
+
 
 class Channel(pg.PlotWidget):
+    """
+    A plot of one curve and, optionally, the sampled points on top of it.
+
+    The curve and marker items are created once and updated in place with
+    setData, so a redraw does not rebuild the scene or reset the view. The
+    curve is kept as a MinMaxPyramid and only the visible part of the level
+    matching the plot's pixel width is drawn, so the drawing cost depends on
+    the screen size rather than the data length and no peak is dropped.
+    Curves of up to PYRAMID_THRESHOLD points are cheap enough to draw whole.
+    Up to MARKER_LIMIT sampled points are drawn as individual symbols;
+    beyond that they are drawn as one path of impulse stems, which is far
+    cheaper to paint. Only the stems near the view are drawn, and where
+    several fall on one pixel only the highest and lowest of them are.
+    """
+
+    MARKER_LIMIT = 2000
+    # curves up to this many points are drawn whole, letting pyqtgraph clip and autorange them
+    PYRAMID_THRESHOLD = 20000
+
     def __init__(self, name, dark_mode, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if not dark_mode:
@@ -11,3 +34,116 @@ class Channel(pg.PlotWidget):
         self.setTitle(name, fontsize=200)
         self.showGrid(x=True, y=True)
         self.setAutoVisible(x=True, y=True)
+
+        self.curve = pg.PlotDataItem()
+        self.pyramid = None
+        self._curve_source = (None, None, None)
+        self.markers = pg.ScatterPlotItem(
+            pen=None, brush="b", symbol="x", name="sample_markers"
+        )
+        self.stems = pg.PlotDataItem(connect="pairs", pen="b")
+        self._stem_source = None
+        for item in (self.curve, self.markers, self.stems):
+            self.addItem(item)
+        # addItem gives every curve the plot's own (disabled) clipping and downsampling,
+        # so they are set afterwards. Peak downsampling thins raw curves below the pyramid
+        # threshold and keeps the min/max pairs of pyramid levels
+        self.curve.setClipToView(True)
+        self.curve.setDownsampling(auto=True, method="peak")
+        self.sigXRangeChanged.connect(self._refresh_curve)
+        self.getViewBox().sigResized.connect(self._refresh_curve)
+        self.sigXRangeChanged.connect(self._refresh_stems)
+        self.getViewBox().sigResized.connect(self._refresh_stems)
+
+    def paintEvent(self, event) -> None:
+        with PROFILER.span("paint"):
+            super().paintEvent(event)
+
+    def set_curve(self, x, y, pen=None, token=None) -> None:
+        """
+        Replaces the data of the curve, keeping the current view.
+
+        The pyramid is only rebuilt when x or y is a different array or `token`
+        changed. Callers that rewrite y in place (like the noise buffers of a
+        Signal) must pass a token that changes with its contents.
+        """
+        if pen is not None:
+            self.curve.setPen(pen)
+        if len(x) <= self.PYRAMID_THRESHOLD:
+            self.pyramid = None
+            self._curve_source = (None, None, None)
+            self.curve.setData(x, y)
+            return
+        source_x, source_y, source_token = self._curve_source
+        if self.pyramid is None or source_x is not x or source_y is not y or source_token != token:
+            self.pyramid = MinMaxPyramid(x, y)
+            self._curve_source = (x, y, token)
+        self._refresh_curve()
+
+    def _refresh_curve(self, *args) -> None:
+        """
+        Draws the visible part of the curve, plus half a view on each side, at the pixel width
+        """
+        if self.pyramid is None:
+            return
+        x_min, x_max = self.viewRange()[0]
+        margin = (x_max - x_min) / 2
+        pixels = self.getViewBox().width() or 1000
+        self.curve.setData(*self.pyramid.select(x_min - margin, x_max + margin, 2 * pixels))
+
+    def set_markers(self, x, y) -> None:
+        """
+        Replaces the sampled points drawn on top of the curve
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if len(x) <= self.MARKER_LIMIT:
+            self._stem_source = None
+            self.stems.setData([], [])
+            self.markers.setData(x=x, y=y)
+        else:
+            self.markers.setData(x=[], y=[])
+            self._stem_source = (x, y)
+            self._refresh_stems()
+
+    def _refresh_stems(self, *args) -> None:
+        """
+        Draws the stems of the sampled points within half a view of the visible range.
+        Above about one stem per pixel, each block of stems is drawn as a stem to its
+        minimum and one to its maximum.
+        """
+        if self._stem_source is None:
+            return
+        x, y = self._stem_source
+        x_min, x_max = self.viewRange()[0]
+        margin = (x_max - x_min) / 2
+        start = int(np.searchsorted(x, x_min - margin, side="left"))
+        stop = int(np.searchsorted(x, x_max + margin, side="right"))
+        x, y = x[start:stop], y[start:stop]
+        block = len(x) // (2 * int(self.getViewBox().width() or 1000))
+        if block > 1:
+            tail = -len(y) % block
+            y = np.concatenate([y, np.repeat(y[-1], tail)]).reshape(-1, block)
+            x = np.repeat(x[::block], 2)
+            y = np.column_stack([y.min(axis=1), y.max(axis=1)]).ravel()
+        self.stems.setData(
+            np.repeat(x, 2), np.column_stack([np.zeros_like(y), y]).ravel()
+        )
+
+    def clear_data(self) -> None:
+        """
+        Empties the curve and markers without removing them from the plot
+        """
+        self.pyramid = None
+        self._curve_source = (None, None, None)
+        self.curve.setData([], [])
+        self.markers.setData(x=[], y=[])
+        self._stem_source = None
+        self.stems.setData([], [])
+
+    def reset_view(self, x_min: float, x_max: float, width: float = 3) -> None:
+        """
+        Shows the first `width` seconds of data spanning [x_min, x_max]
+        """
+        self.setXRange(x_min, x_min + width)
+        self.setLimits(xMin=x_min - 0.2, xMax=x_max + 0.2)
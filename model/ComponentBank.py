@@ -0,0 +1,191 @@
+import numpy as np
+
+from model.Component import Component
+
+
+class ComponentBank:
+    """
+    The sinusoidal components of a signal, stored as contiguous arrays.
+
+    Amplitudes, frequencies and shifts live in one (3, capacity) float64
+    array that grows geometrically, so adding components one at a time is
+    amortized O(1) and bulk operations are single NumPy calls. A component
+    is the term amplitude * sin(2 * pi * frequency * t + shift * pi), as for
+    Component.
+
+    The largest and smallest frequencies are cached. Adding components
+    updates them in place, and removing or editing the current extreme
+    recomputes them on the next query.
+
+    Attributes:
+        amplitude (numpy.ndarray): A view of the amplitudes.
+        frequency (numpy.ndarray): A view of the frequencies.
+        shift (numpy.ndarray): A view of the phase shifts, in units of pi.
+    """
+
+    def __init__(self, capacity: int = 16) -> None:
+        self._data = np.zeros((3, capacity))
+        self._size = 0
+        self._max_frequency = None
+        self._min_frequency = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def amplitude(self) -> np.ndarray:
+        return self._data[0, : self._size]
+
+    @property
+    def frequency(self) -> np.ndarray:
+        return self._data[1, : self._size]
+
+    @property
+    def shift(self) -> np.ndarray:
+        return self._data[2, : self._size]
+
+    @property
+    def params(self) -> np.ndarray:
+        """
+        Returns an (n, 3) view of (amplitude, frequency, shift) per component
+        """
+        return self._data[:, : self._size].T
+
+    def add(self, amplitude, frequency, shift) -> None:
+        """
+        Appends components given as equally long arrays (or scalars)
+        """
+        amplitude, frequency, shift = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(amplitude, dtype=float)),
+            np.atleast_1d(np.asarray(frequency, dtype=float)),
+            np.atleast_1d(np.asarray(shift, dtype=float)),
+        )
+        count = len(frequency)
+        if count == 0:
+            return
+        self._reserve(self._size + count)
+        rows = slice(self._size, self._size + count)
+        self._data[0, rows] = amplitude
+        self._data[1, rows] = frequency
+        self._data[2, rows] = shift
+        was_empty = self._size == 0
+        self._size += count
+        if was_empty:
+            self._max_frequency = frequency.max()
+            self._min_frequency = frequency.min()
+        else:
+            if self._max_frequency is not None:
+                self._max_frequency = max(self._max_frequency, frequency.max())
+            if self._min_frequency is not None:
+                self._min_frequency = min(self._min_frequency, frequency.min())
+
+    def add_params(self, params) -> None:
+        """
+        Appends components given as an (n, 3) array of (amplitude, frequency, shift)
+        """
+        params = np.atleast_2d(np.asarray(params, dtype=float)).reshape(-1, 3)
+        self.add(params[:, 0], params[:, 1], params[:, 2])
+
+    def remove(self, indices) -> None:
+        """
+        Removes the components at the given indices
+        """
+        keep = np.ones(self._size, dtype=bool)
+        keep[indices] = False
+        removed = self.frequency[~keep]
+        kept = self._data[:, : self._size][:, keep]
+        self._size = kept.shape[1]
+        self._data[:, : self._size] = kept
+        self._forget_extremes(removed)
+
+    def update(self, indices, amplitude=None, frequency=None, shift=None) -> None:
+        """
+        Sets the amplitude, frequency and/or shift of the components at the given indices
+        """
+        if amplitude is not None:
+            self.amplitude[indices] = amplitude
+        if frequency is not None:
+            self._forget_extremes(self.frequency[indices])
+            self.frequency[indices] = frequency
+            changed = np.atleast_1d(self.frequency[indices])
+            if self._max_frequency is not None:
+                self._max_frequency = max(self._max_frequency, changed.max())
+            if self._min_frequency is not None:
+                self._min_frequency = min(self._min_frequency, changed.min())
+        if shift is not None:
+            self.shift[indices] = shift
+
+    def clear(self) -> None:
+        self._size = 0
+        self._max_frequency = None
+        self._min_frequency = None
+
+    def max_frequency(self) -> float:
+        """
+        Returns the largest frequency, or 0 when there are no components
+        """
+        if self._size == 0:
+            return 0
+        if self._max_frequency is None:
+            self._max_frequency = self.frequency.max()
+        return float(self._max_frequency)
+
+    def min_frequency(self) -> float:
+        """
+        Returns the smallest frequency, or infinity when there are no components
+        """
+        if self._size == 0:
+            return float("inf")
+        if self._min_frequency is None:
+            self._min_frequency = self.frequency.min()
+        return float(self._min_frequency)
+
+    def evaluate(self, x, start: int = 0, chunk_bytes: int = 32 << 20) -> np.ndarray:
+        """
+        Returns the sum of the components from index `start` on the time grid x.
+
+        The components are evaluated in blocks whose (components, len(x))
+        matrix fits in `chunk_bytes`, and each block is summed with one
+        matrix-vector product by the amplitudes.
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.zeros(len(x))
+        rows = max(1, chunk_bytes // (8 * max(1, len(x))))
+        for first in range(start, self._size, rows):
+            block = slice(first, min(first + rows, self._size))
+            phase = np.multiply.outer(2 * np.pi * self.frequency[block], x)
+            phase += np.pi * self.shift[block, None]
+            y += self.amplitude[block] @ np.sin(phase, out=phase)
+        return y
+
+    def component(self, index: int) -> Component:
+        """
+        Returns one component as a Component object
+        """
+        amplitude, frequency, shift = self._data[:, index]
+        return Component(float(amplitude), float(frequency), float(shift))
+
+    def components(self) -> list:
+        """
+        Returns every component as a list of Component objects
+        """
+        return [self.component(i) for i in range(self._size)]
+
+    def _reserve(self, size: int) -> None:
+        capacity = self._data.shape[1]
+        if size > capacity:
+            data = np.zeros((3, max(size, 2 * capacity)))
+            data[:, : self._size] = self._data[:, : self._size]
+            self._data = data
+
+    def _forget_extremes(self, frequencies) -> None:
+        """
+        Drops the cached extremes that are among the given (removed or replaced) frequencies
+        """
+        frequencies = np.atleast_1d(frequencies)
+        if len(frequencies) == 0:
+            return
+        if self._max_frequency is not None and frequencies.max() >= self._max_frequency:
+            self._max_frequency = None
+        if self._min_frequency is not None and frequencies.min() <= self._min_frequency:
+            self._min_frequency = None
@@ -0,0 +1,42 @@
+from model.Component import Component
+
+
+class ComponentView(Component):
+    """
+    A component of a signal whose parameters live in the signal's ComponentBank.
+
+    Reading an attribute reads the bank, and setting one (directly or through
+    change_amplitude, change_frequency and change_shift) goes through
+    Signal.update_components, so the signal is re-synthesized. A view refers
+    to its component by index, so it is only valid until a component before
+    it is removed.
+    """
+
+    def __init__(self, signal, index: int) -> None:
+        # Component.__init__ is not called, since it would overwrite the parameters
+        self._signal = signal
+        self._index = index
+
+    @property
+    def amplitude(self) -> float:
+        return float(self._signal.bank.amplitude[self._index])
+
+    @amplitude.setter
+    def amplitude(self, value: float) -> None:
+        self._signal.update_components(self._index, amplitude=value)
+
+    @property
+    def frequency(self) -> float:
+        return float(self._signal.bank.frequency[self._index])
+
+    @frequency.setter
+    def frequency(self, value: float) -> None:
+        self._signal.update_components(self._index, frequency=value)
+
+    @property
+    def shift(self) -> float:
+        return float(self._signal.bank.shift[self._index])
+
+    @shift.setter
+    def shift(self, value: float) -> None:
+        self._signal.update_components(self._index, shift=value)
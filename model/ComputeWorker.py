@@ -0,0 +1,84 @@
+import traceback
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+
+class _TaskSignals(QObject):
+    finished = pyqtSignal(int, object, object)
+
+
+class _ComputeTask(QRunnable):
+    def __init__(self, generation: int, request, compute, signals: _TaskSignals):
+        super().__init__()
+        self.generation = generation
+        self.request = request
+        self.compute = compute
+        self.signals = signals
+
+    def run(self) -> None:
+        try:
+            result = self.compute()
+        except Exception as error:
+            result = error
+        self.signals.finished.emit(self.generation, self.request, result)
+
+
+class ComputeWorker(QObject):
+    """
+    Runs computations on a thread pool, keeping only the latest request.
+
+    At most one computation is in flight. Submitting while one is running
+    replaces any queued request, so a burst of slider moves computes the
+    value the burst started with and the value it ended with, nothing in
+    between. Results of requests that were superseded before they finished
+    are dropped instead of being delivered.
+
+    Signals:
+        resultReady(request, result): Emitted on the GUI thread for the latest request.
+    """
+
+    resultReady = pyqtSignal(object, object)
+
+    def __init__(self, pool: QThreadPool = None) -> None:
+        super().__init__()
+        self.pool = pool if pool is not None else QThreadPool.globalInstance()
+        self._generation = 0
+        self._busy = False
+        self._pending = None
+        self._signals = _TaskSignals()
+        self._signals.finished.connect(self._finished)
+
+    def submit(self, request, compute) -> None:
+        """
+        Schedules compute() for a request, superseding every earlier request
+        """
+        self._generation += 1
+        self._pending = (self._generation, request, compute)
+        if not self._busy:
+            self._start_pending()
+
+    def cancel(self) -> None:
+        """
+        Drops the queued request and the result of the one in flight
+        """
+        self._generation += 1
+        self._pending = None
+
+    def is_busy(self) -> bool:
+        return self._busy
+
+    def _start_pending(self) -> None:
+        generation, request, compute = self._pending
+        self._pending = None
+        self._busy = True
+        self.pool.start(_ComputeTask(generation, request, compute, self._signals))
+
+    @pyqtSlot(int, object, object)
+    def _finished(self, generation: int, request, result) -> None:
+        self._busy = False
+        if isinstance(result, Exception):
+            traceback.print_exception(result)
+        elif generation == self._generation:
+            self.resultReady.emit(request, result)
+        if self._pending is not None:
+            self._start_pending()
@@ -0,0 +1,313 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+
+class CsvCache:
+    """
+    A binary cache of parsed CSV recordings.
+
+    Recordings are read with `read_window`. The first read of a file parses
+    it with pandas and stores all of its columns as one (n_columns, n_rows)
+    float64 `.npy` array named after a hash of the file contents. A small
+    JSON entry per source path remembers the file size and modification
+    time it was built from; while those match, later reads memory-map the
+    array without touching the CSV text.
+    If the size or mtime changes the contents are re-hashed, so a touched
+    but unchanged file (or a copy of a cached file) still reuses its array.
+
+    The array is written by parsing the file in chunks of `chunk_rows` rows
+    into a memory-mapped `.npy`, sized from a row-offset index that holds
+    the byte position of every `stride`-th row and is built with one pass
+    over the file. Peak memory while caching a recording is therefore one
+    chunk, not the whole file. Windows of a cached recording are copied out
+    of the memory map. Should the cache directory be unwritable, or the
+    cache be opened with `writable=False`, a window read seeks to the
+    nearest indexed row and parses only the requested rows instead.
+
+    Attributes:
+        cache_dir (str): The directory holding the cache entries.
+        writable (bool): Whether new entries and indexes are written; existing ones are read either way.
+        stride (int): The number of rows between two indexed byte offsets.
+        chunk_rows (int): The number of rows parsed at once when reading a window.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = None,
+        stride: int = 1024,
+        chunk_rows: int = 65536,
+        writable: bool = True,
+    ) -> None:
+        if cache_dir is None:
+            cache_dir = os.environ.get(
+                "SAMPLING_STUDIO_CACHE",
+                os.path.join(os.path.expanduser("~"), ".cache", "sampling-studio"),
+            )
+        self.cache_dir = cache_dir
+        self.stride = stride
+        self.chunk_rows = chunk_rows
+        self.writable = writable
+
+    def read_window(self, file_path: str, offset: int = 0, length: int = None):
+        """
+        Returns the column names and a (n_columns, length) array of rows [offset, offset + length).
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the CSV file.
+        offset : int, optional
+            The first data row to read. Default is 0.
+        length : int, optional
+            The number of rows to read. Default is every row after `offset`.
+
+        Returns
+        -------
+        tuple
+            A list of column names and the window's data, as a new array.
+
+        The first read of a file caches all of it, and the window is then
+        copied out of the memory map, so later reads of any window never
+        parse text. If the cache cannot be written, only the
+        requested rows are parsed, so peak memory is proportional to the
+        window rather than the file.
+        """
+        file_path = os.path.abspath(file_path)
+        cached = self._cached(file_path)
+        if cached is None:
+            cached = self._store(file_path)
+        index = None
+        if cached is None:
+            index = self.row_index(file_path)
+            columns, n_rows = index["columns"], index["n_rows"]
+        else:
+            columns, n_rows = cached[0], cached[1].shape[1]
+
+        offset = min(max(0, int(offset)), n_rows)
+        stop = n_rows if length is None else min(n_rows, offset + int(length))
+        if cached is not None:
+            return columns, np.array(cached[1][:, offset:stop])
+
+        # pandas is only needed when text is actually parsed, so it is imported lazily
+        import pandas as pd
+
+        window = np.empty((len(columns), stop - offset))
+        with open(file_path, "rb") as f:
+            f.seek(int(index["offsets"][offset // self.stride]))
+            for _ in range(offset % self.stride):
+                f.readline()
+            filled = 0
+            if stop > offset:
+                for chunk in pd.read_csv(
+                    f,
+                    header=None,
+                    names=columns,
+                    nrows=stop - offset,
+                    chunksize=self.chunk_rows,
+                ):
+                    values = chunk.to_numpy(dtype=np.float64).T
+                    window[:, filled : filled + values.shape[1]] = values
+                    filled += values.shape[1]
+        return columns, window
+
+    def row_index(self, file_path: str) -> dict:
+        """
+        Returns the row-offset index of a CSV file, building it on first use.
+
+        Returns
+        -------
+        dict
+            The column names ("columns"), the number of data rows ("n_rows") and the
+            byte offsets of rows 0, stride, 2 * stride, ... ("offsets").
+        """
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        index_path = self._index_path(file_path)
+        try:
+            with np.load(index_path, allow_pickle=False) as stored:
+                if (
+                    int(stored["size"]) == stat.st_size
+                    and int(stored["mtime_ns"]) == stat.st_mtime_ns
+                    and int(stored["stride"]) == self.stride
+                ):
+                    return {
+                        "columns": [str(c) for c in stored["columns"]],
+                        "n_rows": int(stored["n_rows"]),
+                        "offsets": stored["offsets"],
+                    }
+        except (OSError, ValueError, KeyError):
+            pass
+
+        index = self._build_row_index(file_path)
+        if not self.writable:
+            return index
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{index_path}.{os.getpid()}.tmp.npz"
+            np.savez(
+                temp_path,
+                columns=np.array(index["columns"]),
+                n_rows=index["n_rows"],
+                offsets=index["offsets"],
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                stride=self.stride,
+            )
+            os.replace(temp_path, index_path)
+        except OSError:
+            pass
+        return index
+
+    def _build_row_index(self, file_path: str) -> dict:
+        """
+        Scans a CSV file once, recording the byte offset of every `stride`-th data row
+        """
+        size = os.path.getsize(file_path)
+        with open(file_path, "rb") as f:
+            header = f.readline()
+            columns = header.decode("utf-8").rstrip("\r\n").split(",")
+            position = len(header)
+            offsets = [position] if position < size else []
+            n_rows = len(offsets)
+            for block in iter(lambda: f.read(1 << 22), b""):
+                newlines = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10)
+                starts = newlines + position + 1
+                starts = starts[starts < size]
+                rows = n_rows + np.arange(len(starts))
+                offsets.extend(starts[rows % self.stride == 0].tolist())
+                n_rows += len(starts)
+                position += len(block)
+        return {
+            "columns": columns,
+            "n_rows": n_rows,
+            "offsets": np.array(offsets, dtype=np.int64),
+        }
+
+    def _store(self, file_path: str):
+        """
+        Caches a file's columns under its content hash and returns them memory-mapped, or None if the cache is unwritable or not `writable`
+        """
+        if not self.writable:
+            return None
+        stat = os.stat(file_path)
+        content_hash = self._hash_file(file_path)
+        cached = self._open(content_hash)
+        if cached is None:
+            try:
+                self._write_data(content_hash, file_path)
+            except OSError:
+                return None
+            cached = self._open(content_hash)
+            if cached is None:
+                return None
+
+        try:
+            self._write_json(
+                self._entry_path(file_path),
+                {
+                    "path": file_path,
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "content_hash": content_hash,
+                },
+            )
+        except OSError:
+            pass
+        return cached
+
+    def _cached(self, file_path: str):
+        """
+        Returns the cached columns and data if they are still valid for the file, without re-hashing it
+        """
+        entry = self._read_json(self._entry_path(file_path))
+        stat = os.stat(file_path)
+        if (
+            entry is None
+            or entry["size"] != stat.st_size
+            or entry["mtime_ns"] != stat.st_mtime_ns
+        ):
+            return None
+        return self._open(entry["content_hash"])
+
+    def _open(self, content_hash: str):
+        """
+        Returns the cached columns and memory-mapped data for a content hash, or None
+        """
+        columns = self._read_json(self._columns_path(content_hash))
+        if columns is None:
+            return None
+        try:
+            return columns, np.load(self._data_path(content_hash), mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+
+    def _entry_path(self, file_path: str) -> str:
+        key = hashlib.sha1(file_path.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _index_path(self, file_path: str) -> str:
+        key = hashlib.sha1(file_path.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.index.npz")
+
+    def _data_path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{content_hash}.npy")
+
+    def _columns_path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{content_hash}.columns.json")
+
+    def _read_json(self, path: str):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_json(self, path: str, value) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f)
+        os.replace(temp_path, path)
+
+    def _write_data(self, content_hash: str, file_path: str) -> None:
+        """
+        Parses a CSV file chunk by chunk into the `.npy` array of its content hash
+        """
+        index = self.row_index(file_path)
+        columns, n_rows = index["columns"], index["n_rows"]
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data_path = self._data_path(content_hash)
+        temp_path = f"{data_path}.{os.getpid()}.tmp"
+        if n_rows == 0:
+            with open(temp_path, "wb") as f:
+                np.save(f, np.empty((len(columns), 0)))
+        else:
+            import pandas as pd
+
+            data = np.lib.format.open_memmap(
+                temp_path, mode="w+", dtype=np.float64, shape=(len(columns), n_rows)
+            )
+            filled = 0
+            for chunk in pd.read_csv(file_path, chunksize=self.chunk_rows):
+                values = chunk.to_numpy(dtype=np.float64).T
+                data[:, filled : filled + values.shape[1]] = values
+                filled += values.shape[1]
+            data.flush()
+            del data
+            if filled != n_rows:
+                os.remove(temp_path)
+                raise OSError(f"{file_path} has {filled} parsed rows, but {n_rows} lines")
+        os.replace(temp_path, data_path)
+        # The columns file is written last, so its presence marks a complete entry.
+        self._write_json(self._columns_path(content_hash), columns)
+
+    @staticmethod
+    def _hash_file(file_path: str) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
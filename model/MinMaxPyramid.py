@@ -0,0 +1,73 @@
+import numpy as np
+
+
+class MinMaxPyramid:
+    """
+    A multi-resolution min/max summary of a curve, for plotting it at any zoom.
+
+    Level 0 is the curve itself. Each further level splits the previous
+    one into blocks of `factor` points and keeps the minimum and maximum of
+    each block, so level k summarizes blocks of factor**k samples and all
+    levels together take about 2 / (factor - 1) times the curve's memory.
+    Drawing a level as a min/max pair per block keeps every peak of the
+    curve, and picking the level by the pixel width of the plot makes the
+    number of drawn points depend on the screen, not on the data length.
+
+    Attributes:
+        x (numpy.ndarray): The sample times of the curve, in increasing order.
+        y (numpy.ndarray): The curve.
+        factor (int): The number of blocks of one level merged into a block of the next.
+        levels (list): For every level above 0, the (x, minimum, maximum) arrays of its blocks.
+    """
+
+    def __init__(self, x, y, factor: int = 4, min_blocks: int = 256) -> None:
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.factor = factor
+        self.levels = []
+        block_x, low, high = self.x, self.y, self.y
+        while len(low) > min_blocks:
+            tail = -len(low) % factor
+            if tail:
+                # repeating the last value leaves the last block's extremes unchanged
+                low = np.concatenate([low, np.repeat(low[-1], tail)])
+                high = np.concatenate([high, np.repeat(high[-1], tail)])
+            low = low.reshape(-1, factor).min(axis=1)
+            high = high.reshape(-1, factor).max(axis=1)
+            block_x = block_x[::factor]
+            self.levels.append((block_x, low, high))
+
+    def level_for(self, samples: int, pixels: int) -> int:
+        """
+        Returns the coarsest level whose blocks are no wider than one pixel
+        when `samples` points of the curve span `pixels` pixels
+        """
+        level = 0
+        while (
+            level < len(self.levels)
+            and samples >= self.factor ** (level + 1) * pixels
+        ):
+            level += 1
+        return level
+
+    def select(self, x_min: float, x_max: float, pixels: int) -> tuple:
+        """
+        Returns the points to draw for the interval [x_min, x_max] at a plot width of `pixels`.
+
+        The raw curve is returned when it has fewer than about one point per
+        pixel in the interval; otherwise each block of the chosen level is
+        drawn as its minimum followed by its maximum. One extra block on each
+        side keeps the line running past the edges of the interval.
+        """
+        start = max(int(np.searchsorted(self.x, x_min, side="left")) - 1, 0)
+        stop = min(int(np.searchsorted(self.x, x_max, side="right")) + 1, len(self.x))
+        level = self.level_for(stop - start, max(int(pixels), 1))
+        if level == 0:
+            return self.x[start:stop], self.y[start:stop]
+        block_x, low, high = self.levels[level - 1]
+        size = self.factor**level
+        first = start // size
+        last = -(-stop // size)
+        x = np.repeat(block_x[first:last], 2)
+        y = np.column_stack([low[first:last], high[first:last]]).ravel()
+        return x, y
@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+import numpy as np
+
+
+class _Span:
+    __slots__ = ("profiler", "stage", "start")
+
+    def __init__(self, profiler: "Profiler", stage: str) -> None:
+        self.profiler = profiler
+        self.stage = stage
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler.record(self.stage, time.perf_counter() - self.start)
+
+
+class Profiler:
+    """
+    Times named stages of the redraw pipeline.
+
+    Each stage keeps its last `window` durations in a ring buffer, from
+    which summary() derives the percentiles and a histogram over BINS.
+    While disabled, span() returns a shared no-op context manager, so an
+    instrumented call costs one attribute check.
+
+    The global PROFILER is enabled by setting SAMPLING_STUDIO_PROFILE=1, or
+    at run time with set_enabled.
+    """
+
+    # histogram bin edges in seconds, from 10 µs to 10 s
+    BINS = np.logspace(-5, 1, 13)
+
+    _NOOP = nullcontext()
+
+    def __init__(self, enabled: bool = False, window: int = 512) -> None:
+        self.enabled = enabled
+        self.window = window
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def set_enabled(self, enabled: bool) -> None:
+        self.enabled = enabled
+
+    def span(self, stage: str):
+        """
+        Returns a context manager timing its body as one run of a stage
+        """
+        if not self.enabled:
+            return self._NOOP
+        return _Span(self, stage)
+
+    def record(self, stage: str, seconds: float) -> None:
+        """
+        Adds one duration to a stage
+        """
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = [np.zeros(self.window), 0]
+            buffer, count = entry
+            buffer[count % self.window] = seconds
+            entry[1] = count + 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+
+    def stages(self) -> list:
+        with self._lock:
+            return list(self._stages)
+
+    def durations(self, stage: str) -> np.ndarray:
+        """
+        Returns the recorded durations of a stage, oldest first
+        """
+        with self._lock:
+            buffer, count = self._stages[stage]
+            if count <= self.window:
+                return buffer[:count].copy()
+            start = count % self.window
+            return np.concatenate([buffer[start:], buffer[:start]])
+
+    def summary(self) -> dict:
+        """
+        Returns, for every stage, the total count and the statistics of its recent durations in seconds
+        """
+        result = {}
+        for stage in self.stages():
+            durations = self.durations(stage)
+            p50, p95 = np.percentile(durations, [50, 95])
+            result[stage] = {
+                "count": self._stages[stage][1],
+                "last": float(durations[-1]),
+                "mean": float(durations.mean()),
+                "p50": float(p50),
+                "p95": float(p95),
+                "max": float(durations.max()),
+                "histogram": np.histogram(durations, self.BINS)[0].tolist(),
+            }
+        return result
+
+    def format(self) -> str:
+        """
+        Returns a one-line-per-stage text table of the recent durations in milliseconds
+        """
+        lines = [f"{'stage':12} {'last':>8} {'p50':>8} {'p95':>8} {'max':>8}"]
+        for stage, stats in self.summary().items():
+            lines.append(
+                f"{stage:12} "
+                + " ".join(
+                    f"{stats[field] * 1e3:8.2f}" for field in ("last", "p50", "p95", "max")
+                )
+            )
+        return "\n".join(lines)
+
+    def dump(self, file_path: str) -> None:
+        """
+        Writes the summary and the histogram bin edges to a JSON file
+        """
+        with open(file_path, "w") as f:
+            json.dump(
+                {"bins": self.BINS.tolist(), "stages": self.summary()}, f, indent=2
+            )
+
+
+PROFILER = Profiler(enabled=os.environ.get("SAMPLING_STUDIO_PROFILE") == "1")
@@ -0,0 +1,78 @@
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    A least-recently-used cache of sampling and reconstruction results.
+
+    Each entry is a tuple of NumPy arrays. The arrays are made read-only when
+    stored, and the least recently used entries are evicted once their total
+    size exceeds `max_bytes`. The cache may be shared between threads.
+
+    Attributes:
+        max_bytes (int): The memory cap for all cached arrays.
+        nbytes (int): The memory currently held by cached arrays.
+        hits (int): The number of lookups that found an entry.
+        misses (int): The number of lookups that did not.
+    """
+
+    def __init__(self, max_bytes: int = 256 << 20) -> None:
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the entry for a key, or None, marking it as most recently used
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, arrays: tuple) -> None:
+        """
+        Stores a tuple of arrays under a key, evicting old entries to stay under the cap
+        """
+        size = sum(array.nbytes for array in arrays)
+        if size > self.max_bytes:
+            return
+        for array in arrays:
+            array.setflags(write=False)
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= sum(array.nbytes for array in self._entries.pop(key))
+            self._entries[key] = arrays
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= sum(array.nbytes for array in evicted)
+
+    def items(self) -> list:
+        """
+        Returns the (key, arrays) pairs of every entry, least recently used first
+        """
+        with self._lock:
+            return list(self._entries.items())
+
+    def clear(self) -> None:
+        """
+        Drops every entry
+        """
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
@@ -0,0 +1,144 @@
+from fractions import Fraction
+
+import numpy as np
+
+from model.WindowedSinc import WindowedSinc
+
+
+class Sampler:
+    """
+    Evaluates a uniformly sampled source signal at arbitrary sampling instants.
+
+    When the target rate divides the source rate (L = 1), every sampling
+    instant is a source sample and the values are taken by strided indexing,
+    with no interpolation at all. When the target rate is any other rational
+    multiple L/M of the source rate, the sampling instants fall on only L
+    distinct fractional positions between source samples. The kernel is then tabulated once per phase (a polyphase
+    FIR filter bank) and every output sample is a dot product of 2*K taps,
+    costing O(N * taps). Any other rate falls back to evaluating the same
+    windowed-sinc kernel directly at each instant.
+
+    The filter bank is the source's own band-limited interpolation kernel,
+    with no anti-aliasing low-pass at the target rate: undersampling is
+    expected to alias, exactly like point-sampling the continuous signal.
+
+    Attributes:
+        kernel (WindowedSinc): The interpolation kernel shared by both paths.
+        max_denominator (int): The largest number of polyphase branches (L) to tabulate.
+        rtol (float): The relative tolerance when matching the rate ratio to a fraction.
+    """
+
+    def __init__(
+        self,
+        kernel: WindowedSinc = None,
+        max_denominator: int = 1000,
+        rtol: float = 1e-9,
+    ) -> None:
+        self.kernel = kernel if kernel is not None else WindowedSinc()
+        self.max_denominator = max_denominator
+        self.rtol = rtol
+        self._filter_banks = {}
+
+    def rational_ratio(self, source_freq: float, target_freq: float):
+        """
+        Returns (L, M) with target_freq / source_freq == L / M, or None if no small fraction matches
+        """
+        if source_freq <= 0 or target_freq <= 0:
+            return None
+        ratio = target_freq / source_freq
+        fraction = Fraction(ratio).limit_denominator(self.max_denominator)
+        if fraction.numerator == 0:
+            return None
+        if abs(float(fraction) - ratio) > self.rtol * ratio:
+            return None
+        # L / M = target / source: L output phases per M input samples.
+        return fraction.numerator, fraction.denominator
+
+    def filter_bank(self, phases: int):
+        """
+        Returns the (phases, 2K) table of kernel taps for every fractional position p / phases
+        """
+        key = (phases, self.kernel.half_width, self.kernel.window, self.kernel.beta)
+        if key not in self._filter_banks:
+            taps = np.arange(-self.kernel.half_width + 1, self.kernel.half_width + 1)
+            offsets = np.arange(phases)[:, None] / phases - taps
+            self._filter_banks[key] = self.kernel.kernel(offsets)
+        return self._filter_banks[key]
+
+    def sample(self, x, y, t, fs: float = None, source_freq: float = None):
+        """
+        Evaluates the signal (x, y) at the instants t.
+
+        Parameters
+        ----------
+        x : array_like
+            The uniformly spaced source time values.
+        y : array_like
+            The source amplitude values.
+        t : array_like
+            The sampling instants.
+        fs : float, optional
+            The rate of t. When given and rationally related to the source rate,
+            the strided or polyphase path is used.
+        source_freq : float, optional
+            The exact rate of x. Default is derived from the spacing of x, which
+            may be off by rounding for grids built with np.arange.
+
+        Returns
+        -------
+        numpy.ndarray
+            The signal values at t. Instants outside the source range take the
+            first or last source value.
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        t = np.asarray(t, dtype=float)
+        if len(t) == 0:
+            return np.zeros(0)
+        if source_freq:
+            dx = 1 / source_freq
+        else:
+            dx = (x[-1] - x[0]) / (len(x) - 1)
+
+        ratio = self.rational_ratio(1 / dx, fs) if fs else None
+        start = (t[0] - x[0]) / dx
+        if ratio is not None and np.isclose(start, np.round(start)):
+            up, down = ratio
+            if up == 1:
+                values = self._decimate(y, int(np.round(start)), len(t), down)
+            else:
+                values = self._polyphase(y, int(np.round(start)), len(t), up, down)
+        else:
+            values = self.kernel.interpolate(x, y, t, dx)
+
+        values[t < x[0]] = y[0]
+        values[t > x[-1]] = y[-1]
+        return values
+
+    def _decimate(self, y, start: int, count: int, down: int):
+        """
+        Takes y at source positions start + n * down for n in [0, count)
+        """
+        index = start + np.arange(count, dtype=np.int64) * down
+        return y[np.clip(index, 0, len(y) - 1)]
+
+    def _polyphase(self, y, start: int, count: int, up: int, down: int):
+        """
+        Evaluates y at source positions start + n * down / up for n in [0, count)
+        """
+        bank = self.filter_bank(up)
+        taps = np.arange(-self.kernel.half_width + 1, self.kernel.half_width + 1)
+        steps = np.arange(count, dtype=np.int64) * down
+        base = start + steps // up
+        phase = steps % up
+
+        values = np.empty(count)
+        rows = max(1, self.kernel.chunk_size // len(taps))
+        for first in range(0, count, rows):
+            chunk = slice(first, first + rows)
+            index = base[chunk, None] + taps
+            valid = (index >= 0) & (index < len(y))
+            weights = np.where(valid, bank[phase[chunk]], 0.0)
+            index = np.clip(index, 0, len(y) - 1)
+            values[chunk] = np.einsum("ij,ij->i", weights, y[index])
+        return values
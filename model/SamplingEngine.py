@@ -0,0 +1,279 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from model.AliasEngine import AliasEngine
+from model.Component import Component
+from model.Profiler import PROFILER
+from model.ResultCache import ResultCache
+from model.Signal import Signal
+
+
+class SamplingEngine:
+    """
+    The sampling and reconstruction core, usable without Qt.
+
+    It keeps the list of signals and computes their sampling, reconstruction
+    and error, caching the results. SamplingHandler builds the plots and
+    background workers on top of it; scripts can use it directly.
+    """
+
+    # beyond this many components the closed form costs more than a sinc reconstruction
+    ANALYTIC_MAX_COMPONENTS = 256
+
+    def __init__(self, cache_bytes: int = 256 << 20) -> None:
+        self.signals = []
+        self.cache = ResultCache(cache_bytes)
+        self.alias_engine = AliasEngine()
+
+    def add_signal_component(
+        self, sig: Signal, amplitude: float, frequency: float, shift: float
+    ) -> None:
+        """
+        Adds a component to a signal at a given index
+        """
+        signal_component = Component(amplitude, frequency, shift)
+        if sig in self.signals:
+            index = self.signals.index(sig)
+            self.signals[index].add_component(signal_component)
+
+    def add_signal(self, sig) -> None:
+        """
+        Adds a signal to the mixer
+        """
+        self.signals.append(sig)
+
+    def delete_signal(self, sig) -> None:
+        self.signals.remove(sig)
+
+    def get_signal_components(self, index: int) -> list:
+        """
+        Returns a list of components for a given signal
+        """
+        return self.signals[index].get_components()
+
+    def get_signal(self, index: int) -> Signal:
+        """
+        Returns a signal at a given index
+        """
+        return self.signals[index]
+
+    def get_signals(self) -> list:
+        """
+        Returns a list of signals
+        """
+        return self.signals
+
+    def change_nq_rate(self, nq_rate, sig):
+        """
+        Changes the sampling frequency of a signal
+        """
+        sig.new_sampling_freq = nq_rate * sig.fmax + 1
+
+    def change_sampling_freq(self, freq, sig):
+        """
+        Changes the sampling frequency of a signal
+        """
+        sig.new_sampling_freq = freq
+
+    def result_key(self, sig: Signal, sampling_freq: float = None) -> tuple:
+        """
+        Returns the cache key of a signal's sampling and reconstruction at a sampling frequency
+        """
+        if sampling_freq is None:
+            sampling_freq = sig.new_sampling_freq
+        return (
+            sig.version,
+            sampling_freq,
+            sig.SNR,
+            sig.noise_seed,
+            sig.reconstruction_mode,
+            sig.interpolator.half_width,
+            sig.interpolator.window,
+        )
+
+    def sample_and_reconstruct(
+        self, sig: Signal, sampling_freq: float, y, start: int = 0, stop: int = None
+    ) -> tuple:
+        """
+        Samples the values y of a signal and reconstructs them, without touching the cache.
+        Returns the sampled times, the sampled values, the reconstruction and the error.
+
+        The whole signal is sampled, but the reconstruction and error are only
+        evaluated on the time grid slice sig.x[start:stop]. Signals that are
+        only a clean sum of components are sampled and reconstructed in closed
+        form (see `is_analytic`).
+        """
+        with PROFILER.span("sample"):
+            if self.is_analytic(sig):
+                x_values = sig.get_impulse_train(sampling_freq)
+                y_values_sampled = self.alias_engine.sample(sig.bank, x_values)
+            else:
+                x_values, y_values_sampled = sig.sample(sampling_freq, y)
+        interpolate, error = self._reconstruct_slice(
+            sig, x_values, y_values_sampled, sampling_freq, y, start, stop
+        )
+        return x_values, y_values_sampled, interpolate, error
+
+    def _reconstruct_slice(self, sig, x_values, y_values_sampled, sampling_freq, y, start, stop):
+        with PROFILER.span("reconstruct"):
+            if self.is_analytic(sig):
+                interpolate = self.alias_engine.reconstruct(
+                    sig.bank, sampling_freq, sig.x[start:stop], sig.x[0]
+                )
+            else:
+                interpolate = sig.reconstruct(
+                    sig.x[start:stop], y_values_sampled, x_values, 1 / sampling_freq
+                )
+        with PROFILER.span("error"):
+            error = np.asarray(y)[start:stop] - interpolate
+        return interpolate, error
+
+    def is_analytic(self, sig: Signal) -> bool:
+        """
+        Returns whether a signal is exactly the sum of its components (synthesized and noise-free),
+        so that its samples and reconstruction follow from the components in closed form
+        """
+        return (
+            not sig.uploaded
+            and not sig.SNR
+            and 0 < len(sig.bank) <= self.ANALYTIC_MAX_COMPONENTS
+        )
+
+    def alias_frequencies(self, sig: Signal, sampling_freq: float = None) -> list:
+        """
+        Returns the (frequency, alias frequency) pair of every component frequency of a
+        synthesized signal at a sampling frequency, or an empty list for recordings
+        """
+        if sampling_freq is None:
+            sampling_freq = sig.new_sampling_freq
+        if sig.uploaded or len(sig.bank) == 0 or sampling_freq <= 0:
+            return []
+        return self.alias_engine.aliases(sig.bank, sampling_freq)
+
+    def visible_slice(self, sig: Signal, x_min: float, x_max: float, margin: float = 1.0) -> tuple:
+        """
+        Returns the (start, stop) indices of the time grid covering [x_min, x_max],
+        widened on each side by `margin` times the width of the interval
+        """
+        width = (x_max - x_min) * margin
+        start = int(np.searchsorted(sig.x, x_min - width, side="left"))
+        stop = int(np.searchsorted(sig.x, x_max + width, side="right"))
+        return start, max(stop, start)
+
+    @staticmethod
+    def result_extent(sig: Signal, result: tuple) -> tuple:
+        """
+        Returns the (start, stop) indices of the time grid a windowed result covers
+        """
+        x_grid = result[2]
+        if len(x_grid) == 0:
+            return 0, 0
+        start = int(np.searchsorted(sig.x, x_grid[0], side="left"))
+        return start, start + len(x_grid)
+
+    def compute_window(
+        self, sig: Signal, sampling_freq: float, y, start: int, stop: int, base: tuple = None
+    ) -> tuple:
+        """
+        Samples a signal and reconstructs it on the time grid slice sig.x[start:stop].
+
+        Returns:
+            tuple: The sampled times, the sampled values, the time grid slice, and the
+                reconstruction and error on that slice.
+
+        `base` is an earlier result for the same signal values and sampling frequency.
+        Its samples are reused, and when its slice overlaps or touches the requested
+        one only the missing parts on either side are reconstructed, so the result
+        covers the union of both. Reconstruction is evaluated pointwise, so the
+        pieces are the same as a reconstruction of the whole union at once.
+        """
+        if base is None:
+            x_values, y_values_sampled, interpolate, error = self.sample_and_reconstruct(
+                sig, sampling_freq, y, start, stop
+            )
+            return x_values, y_values_sampled, sig.x[start:stop], interpolate, error
+
+        x_values, y_values_sampled, _, base_interpolate, base_error = base
+        base_start, base_stop = self.result_extent(sig, base)
+        if base_start <= start and stop <= base_stop:
+            return base
+        if stop < base_start or base_stop < start:
+            # disjoint from the earlier slice: start over instead of filling the gap
+            base_start = base_stop = start
+            base_interpolate = base_error = np.zeros(0)
+        new_start, new_stop = min(start, base_start), max(stop, base_stop)
+        left = self._reconstruct_slice(
+            sig, x_values, y_values_sampled, sampling_freq, y, new_start, base_start
+        )
+        right = self._reconstruct_slice(
+            sig, x_values, y_values_sampled, sampling_freq, y, base_stop, new_stop
+        )
+        return (
+            x_values,
+            y_values_sampled,
+            sig.x[new_start:new_stop],
+            np.concatenate([left[0], base_interpolate, right[0]]),
+            np.concatenate([left[1], base_error, right[1]]),
+        )
+
+    def compute_signal(self, sig: Signal, start: int = 0, stop: int = None) -> tuple:
+        """
+        Samples and reconstructs a signal on the time grid slice sig.x[start:stop],
+        extending the cached result when available.
+
+        Returns:
+            tuple: The sampled times, the sampled values, the time grid slice, and the
+                reconstruction and error on that slice.
+        """
+        if stop is None:
+            stop = len(sig.x)
+        key = self.result_key(sig)
+        base = self.cache.get(key)
+        result = self.compute_window(sig, sig.new_sampling_freq, sig.y, start, stop, base)
+        if result is not base:
+            self.cache.put(key, result)
+        return result
+
+    def sweep(self, sig: Signal, rates=None, workers: int = None, y=None) -> dict:
+        """
+        Computes the reconstruction error of a signal for a whole range of sampling frequencies.
+
+        Args:
+            sig (Signal): The signal to sweep.
+            rates (array_like): The sampling frequencies to evaluate. Default is every
+                integer frequency from 1 to 4 * fmax, the range of the sampling slider.
+            workers (int): The number of threads to spread the rates over. Default is the CPU count.
+            y (array_like): The values to sweep. Default is the current y.
+
+        Returns:
+            dict: The "rates" and, for each of them, the number of "samples" taken and the
+                "rmse" and "max_error" of the reconstruction.
+
+        The sampling and reconstruction kernels spend their time in NumPy, which
+        releases the GIL, so the rates are evaluated in parallel on a thread pool.
+        Only the error metrics are kept, not the reconstructed arrays. They cover
+        the time grid up to the last sampling instant, since the grid points after
+        it are extrapolated rather than reconstructed.
+        """
+        if rates is None:
+            rates = np.arange(1, int(4 * sig.fmax) + 1)
+        rates = np.asarray(rates, dtype=float)
+        if y is None:
+            y = sig.y
+
+        def metrics(rate):
+            x_values, _, _, error = self.sample_and_reconstruct(sig, rate, y)
+            if len(x_values):
+                error = error[: np.searchsorted(sig.x, x_values[-1], side="right")]
+            return len(x_values), np.sqrt(np.mean(error**2)), np.max(np.abs(error))
+
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            results = np.array(list(pool.map(metrics, rates))).reshape(-1, 3)
+        return {
+            "rates": rates,
+            "samples": results[:, 0].astype(int),
+            "rmse": results[:, 1],
+            "max_error": results[:, 2],
+        }
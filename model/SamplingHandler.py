@@ -1,105 +1,156 @@
-import numpy as np
-import pyqtgraph as pg
+import time
 
-from model.Channel import Channel
+from model.Profiler import PROFILER
+from model.SamplingEngine import SamplingEngine
 from model.Signal import Signal
-from model.Component import Component
 
 
-class SamplingHandler:
-    def __init__(self, dark_mode) -> None:
-        self.signals = []
+class SamplingHandler(SamplingEngine):
+    # the number of seconds shown when a signal is first drawn
+    VIEW_WIDTH = 3
+
+    def __init__(self, dark_mode, cache_bytes: int = 256 << 20) -> None:
+        super().__init__(cache_bytes)
+        # pyqtgraph and Qt are only imported once a GUI handler is built
+        from model.Channel import Channel
+        from model.ComputeWorker import ComputeWorker
+
+        self.sweep_channel = Channel("Reconstruction Error vs Sampling Frequency", dark_mode)
+        self.sweep_channel.setLabel("left", "RMS Error", fontsize=60)
+        self.sweep_channel.setLabel("bottom", "Sampling Frequency", fontsize=60)
+        self.shown_signal = None
+        self._requested_at = None
+        self._shown_extent = (0, 0)
+        self._requested = (None, 0, 0)
+        self._resetting_view = False
+        self.worker = ComputeWorker()
+        self.worker.resultReady.connect(self._on_result_ready)
+        self.sweep_worker = ComputeWorker()
+        self.sweep_worker.resultReady.connect(self._on_sweep_ready)
         self.channels = [
             Channel("Original Signal & Sampled Points", dark_mode),
             Channel("Reconstructed Signal", dark_mode),
             Channel("Reconstruction Error", dark_mode),
         ]
+        # the reconstruction and its error share one time axis, which drives what is reconstructed
+        self.channels[2].setXLink(self.channels[1])
+        self.channels[1].sigXRangeChanged.connect(self._on_view_changed)
 
-    def add_signal_component(
-        self, sig: Signal, amplitude: float, frequency: float, shift: float
-    ) -> None:
+    def draw_sweep(self, sig: Signal) -> None:
         """
-        Adds a component to a signal at a given index
+        Sweeps a signal on a background worker and plots the error curve when done
         """
-        signal_component = Component(amplitude, frequency, shift)
         if sig in self.signals:
-            index = self.signals.index(sig)
-            self.signals[index].add_component(signal_component)
-
-    def add_signal(self, sig) -> None:
-        """
-        Adds a signal to the mixer
-        """
-        self.signals.append(sig)
+            # the noisy values live in reused buffers, so the long sweep gets its own copy
+            y = sig.y.copy()
+            self.sweep_worker.submit(sig, lambda: self.sweep(sig, y=y))
 
-    def delete_signal(self, sig) -> None:
-        self.signals.remove(sig)
+    def _on_sweep_ready(self, sig, result: dict) -> None:
+        if sig in self.signals:
+            self.sweep_channel.set_curve(result["rates"], result["rmse"], pen="g")
+            self.sweep_channel.autoRange()
+            self.sweep_channel.show()
 
-    def get_signal_components(self, index: int) -> list:
-        """
-        Returns a list of components for a given signal
+    def draw_signal(self, sig: Signal):
         """
-        return self.signals[index].get_components()
+        Draws a signal on the graph.
 
-    def get_signal(self, index: int) -> Signal:
-        """
-        Returns a signal at a given index
-        """
-        return self.signals[index]
+        Only the part of the time grid shown by the reconstruction and error
+        plots, plus a margin of one view width on each side, is reconstructed.
+        Cached results that cover it are drawn immediately. Otherwise the
+        missing part is computed on a background worker, extending the cached
+        result, and the signal is drawn once it finishes, unless a newer draw
+        was requested in the meantime.
+        """
+        if sig not in self.signals:
+            return
+        if PROFILER.enabled:
+            self._requested_at = time.perf_counter()
+        sampling_freq = sig.new_sampling_freq
+        key = self.result_key(sig, sampling_freq)
+        start, stop = self._required_slice(sig)
+        base = self.cache.get(key)
+        if base is not None:
+            base_start, base_stop = self.result_extent(sig, base)
+            if base_start <= start and stop <= base_stop:
+                self.worker.cancel()
+                self.render_signal(sig, base)
+                return
+        y = sig.y
+        self._requested = (key, start, stop)
+        self.worker.submit(
+            (sig, key),
+            lambda: self.compute_window(sig, sampling_freq, y, start, stop, base),
+        )
 
-    def get_signals(self) -> list:
+    def _required_slice(self, sig: Signal) -> tuple:
         """
-        Returns a list of signals
+        Returns the (start, stop) indices of the time grid the plots need for a signal
         """
-        return self.signals
+        if sig is self.shown_signal:
+            x_min, x_max = self.channels[1].viewRange()[0]
+        else:
+            x_min, x_max = sig.x[0], sig.x[0] + self.VIEW_WIDTH
+        return self.visible_slice(sig, x_min, x_max)
 
-    def change_nq_rate(self, nq_rate, sig):
-        """
-        Changes the sampling frequency of a signal
-        """
-        sig.new_sampling_freq = nq_rate * sig.fmax + 1
+    def _on_view_changed(self, *args) -> None:
+        """
+        Reconstructs more of the shown signal when a plot is panned or zoomed past the computed part
+        """
+        sig = self.shown_signal
+        if sig is None or self._resetting_view or sig not in self.signals:
+            return
+        start, stop = self._required_slice(sig)
+        if self._shown_extent[0] <= start and stop <= self._shown_extent[1]:
+            return
+        # a drag emits many range changes; do not supersede a request that already covers the view
+        key, requested_start, requested_stop = self._requested
+        if key == self.result_key(sig) and requested_start <= start and stop <= requested_stop:
+            return
+        self.draw_signal(sig)
 
-    def change_sampling_freq(self, freq, sig):
-        """
-        Changes the sampling frequency of a signal
-        """
-        sig.new_sampling_freq = freq
+    def _on_result_ready(self, request, result) -> None:
+        sig, key = request
+        self.cache.put(key, result)
+        if sig in self.signals:
+            self.render_signal(sig, result)
+            self._on_view_changed()
 
-    def draw_signal(self, sig: Signal):
+    def render_signal(self, sig: Signal, result: tuple):
         """
-        Draws a signal on the graph
+        Plots a computed sampling and reconstruction of a signal.
+        The view is only reset when a different signal is shown.
         """
-        if sig in self.signals:
+        x_values, y_values_sampled, x_grid, interpolate, error = result
+        if sig is not self.shown_signal:
+            self._resetting_view = True
             for channel in self.channels:
-                channel.clear()
-                channel.setXRange(0, 3)
-                channel.setLimits(xMin=-0.2, xMax=sig.x[-1] + 0.2)
-
-            index = self.signals.index(sig)
-            signal = self.signals[index]
+                channel.reset_view(sig.x[0], sig.x[-1], self.VIEW_WIDTH)
+            self.channels[2].setYRange(-2, 2)
+            self._resetting_view = False
+            self.shown_signal = sig
 
-            signal.sample_signal()
-            sampled_points = signal.sampled_points
-            x_values, y_values_sampled = zip(*sampled_points)
-            interpolate = sig.whittaker_shannon_interpolation(
-                sig.x, y_values_sampled, x_values, 1 / sig.new_sampling_freq
-            )
-            self.channels[0].plot(
-                signal.x,
-                signal.y,
-                pen="r",
-            )
-            sample_markers = pg.ScatterPlotItem(
-                x=x_values,
-                y=y_values_sampled,
-                pen=None,
-                symbol="x",
-                symbolPen="b",
-                name="sample_markers",
+        with PROFILER.span("render"):
+            # the noisy values are rewritten in place, so their pyramid is keyed by what they hold
+            self.channels[0].set_curve(
+                sig.x, sig.y, pen="r", token=(sig.version, sig.SNR, sig.noise_seed)
             )
-            self.channels[0].addItem(sample_markers)
-            self.channels[1].plot(sig.x, interpolate)
+            self.channels[0].set_markers(x_values, y_values_sampled)
+            self.channels[1].set_curve(x_grid, interpolate)
+            self.channels[2].set_curve(x_grid, error, pen="r")
+        self._shown_extent = self.result_extent(sig, result)
+        if PROFILER.enabled and self._requested_at is not None:
+            # from the draw request to the plots holding its result
+            PROFILER.record("latency", time.perf_counter() - self._requested_at)
+            self._requested_at = None
 
-            error = np.array(signal.y) - interpolate
-            self.channels[2].plot(sig.x, error, pen="r")
-            self.channels[2].setYRange(-2, 2)
+    def clear_channels(self) -> None:
+        """
+        Empties every channel
+        """
+        for channel in self.channels:
+            channel.clear_data()
+        self.sweep_channel.clear_data()
+        self.sweep_channel.hide()
+        self.shown_signal = None
+        self._shown_extent = (0, 0)
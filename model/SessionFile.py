@@ -0,0 +1,221 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+from model.Signal import Signal
+from model.SignalStore import SignalStore
+from model.WindowedSinc import WindowedSinc
+
+
+class SessionFile:
+    """
+    A saved session: signals, their components and their computed results.
+
+    The file starts with MAGIC, the length of a JSON header, and the header
+    itself. The header describes every signal and points at raw arrays
+    stored after it, each aligned to ALIGN bytes. Opening a session only
+    parses the header; every array is a read-only np.memmap of its part of
+    the file, so its pages are read from disk when a plot first touches
+    them and a large session opens almost instantly.
+
+    A signal stores its time grid and clean values, or the whole
+    multi-channel store for uploaded recordings, so the lead selector keeps
+    working. It also stores its component parameters, sampling frequency,
+    SNR, noise seed, and reconstruction and grid settings. The cached sampling and
+    reconstruction results of each signal are stored with their cache key,
+    so reopening a session can fill a ResultCache and draw without
+    recomputing.
+
+    Attributes:
+        file_path (str): The path of the session file.
+    """
+
+    MAGIC = b"SSSESS01"
+    ALIGN = 64
+    VERSION = 1
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+
+    def save(self, signals: list, names: list, cache=None) -> None:
+        """
+        Writes signals and, if a ResultCache is given, their cached results to the file.
+
+        Args:
+            signals (list): The Signal objects to save.
+            names (list): The display name of each signal.
+            cache (ResultCache): The cache to take each signal's current results from.
+
+        The file is written next to its destination and moved into place, so
+        arrays still mapped from an earlier version of it stay valid.
+        """
+        arrays = []
+
+        def add(array) -> dict:
+            array = np.ascontiguousarray(array)
+            arrays.append(array)
+            return {
+                "index": len(arrays) - 1,
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+            }
+
+        entries = []
+        for sig, name in zip(signals, names):
+            entry = {
+                "name": name,
+                "uploaded": sig.uploaded,
+                "sampling_freq_given": sig.sampling_freq_given,
+                "new_sampling_freq": sig.new_sampling_freq,
+                "SNR": sig.SNR,
+                "noise_seed": sig.noise_seed,
+                "reconstruction_mode": sig.reconstruction_mode,
+                "half_width": sig.interpolator.half_width,
+                "window": sig.interpolator.window,
+                "beta": sig.interpolator.beta,
+                "duration": sig.duration,
+                "oversampling": sig.oversampling,
+                "components": add(sig.bank.params),
+                "results": [],
+            }
+            if sig.store is not None:
+                entry["store"] = {
+                    "file_path": sig.store.file_path,
+                    "columns": sig.store.columns,
+                    "channels": sig.store.channels,
+                    "sampling_freq": sig.store.sampling_freq,
+                    "data": add(sig.store.data),
+                    "time": add(sig.store.time),
+                }
+                entry["channel"] = sig.channel
+            else:
+                entry["x"] = add(sig.x)
+                entry["original_y"] = add(sig.original_y)
+            if cache is not None:
+                for key, result in cache.items():
+                    if key[0] != sig.version:
+                        continue
+                    x_values, y_values_sampled, x_grid, interpolate, error = result
+                    start = int(np.searchsorted(sig.x, x_grid[0])) if len(x_grid) else 0
+                    entry["results"].append(
+                        {
+                            "key": list(key[1:]),
+                            "start": start,
+                            "stop": start + len(x_grid),
+                            "x_values": add(x_values),
+                            "y_values_sampled": add(y_values_sampled),
+                            "interpolate": add(interpolate),
+                            "error": add(error),
+                        }
+                    )
+            entries.append(entry)
+
+        # the header size depends on the offsets it records, so lay the arrays out after a
+        # first estimate and grow the reserved space until the header fits
+        reserved = self.ALIGN
+        while True:
+            offsets = []
+            position = reserved
+            for array in arrays:
+                offsets.append(position)
+                position += -(-array.nbytes // self.ALIGN) * self.ALIGN
+            header = json.dumps(
+                {"version": self.VERSION, "offsets": offsets, "signals": entries}
+            ).encode()
+            if len(self.MAGIC) + 8 + len(header) <= reserved:
+                break
+            reserved = -(-(len(self.MAGIC) + 8 + len(header)) // self.ALIGN) * self.ALIGN
+
+        temp_path = f"{self.file_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            for offset, array in zip(offsets, arrays):
+                f.seek(offset)
+                array.tofile(f)
+            f.truncate(max([reserved] + [o + a.nbytes for o, a in zip(offsets, arrays)]))
+        os.replace(temp_path, self.file_path)
+
+    def load(self, cache=None) -> list:
+        """
+        Opens the signals of the file, mapping their arrays instead of reading them.
+
+        Args:
+            cache (ResultCache): If given, the saved results are put into it under the
+                keys of the reopened signals.
+
+        Returns:
+            list: A (name, Signal) pair per saved signal.
+        """
+        with open(self.file_path, "rb") as f:
+            if f.read(len(self.MAGIC)) != self.MAGIC:
+                raise ValueError(f"{self.file_path} is not a session file")
+            prefix = f.read(8)
+            if len(prefix) != 8:
+                raise ValueError(f"{self.file_path} is truncated")
+            (length,) = struct.unpack("<Q", prefix)
+            header = json.loads(f.read(length))
+        if header["version"] > self.VERSION:
+            raise ValueError(
+                f"{self.file_path} was saved by a newer version (format {header['version']})"
+            )
+        offsets = header["offsets"]
+
+        def array(description: dict):
+            shape = tuple(description["shape"])
+            if 0 in shape:
+                return np.zeros(shape, dtype=description["dtype"])
+            return np.memmap(
+                self.file_path,
+                dtype=description["dtype"],
+                mode="r",
+                offset=offsets[description["index"]],
+                shape=shape,
+            )
+
+        signals = []
+        for entry in header["signals"]:
+            sig = Signal()
+            sig.noise_seed = entry["noise_seed"]
+            sig.interpolator = WindowedSinc(entry["half_width"], entry["window"], entry["beta"])
+            sig.set_reconstruction_mode(entry["reconstruction_mode"])
+            # sessions saved before the grid settings existed keep the defaults
+            sig.set_grid(entry.get("duration"), entry.get("oversampling"))
+            if "store" in entry:
+                store = SignalStore(sig.csv_cache)
+                store.load_arrays(
+                    entry["store"]["columns"],
+                    entry["store"]["channels"],
+                    array(entry["store"]["data"]),
+                    array(entry["store"]["time"]),
+                    entry["store"]["sampling_freq"],
+                    entry["store"]["file_path"],
+                )
+                sig.load_from_store(store, entry["channel"])
+            else:
+                sig.restore_components(
+                    array(entry["x"]), array(entry["components"]), array(entry["original_y"])
+                )
+            sig.uploaded = entry["uploaded"]
+            sig.sampling_freq_given = entry["sampling_freq_given"]
+            sig.new_sampling_freq = entry["new_sampling_freq"]
+            if entry["SNR"]:
+                # adding the noise reads all of y, so it waits until the signal is used
+                sig.defer_snr(entry["SNR"])
+            if cache is not None:
+                for result in entry["results"]:
+                    cache.put(
+                        (sig.version, *result["key"]),
+                        (
+                            array(result["x_values"]),
+                            array(result["y_values_sampled"]),
+                            sig.x[result["start"] : result["stop"]],
+                            array(result["interpolate"]),
+                            array(result["error"]),
+                        ),
+                    )
+            signals.append((entry["name"], sig))
+        return signals
@@ -1,7 +1,16 @@
+import hashlib
+import itertools
+
 import numpy as np
-import pandas as pd
-from diffpy.utils.parsers.resample import wsinterp
 from model.Component import Component
+from model.ComponentView import ComponentView
+from model.CsvCache import CsvCache
+from model.SignalStore import SignalStore
+from model.ResultCache import ResultCache
+from model.Sampler import Sampler
+from model.SpectralInterpolator import SpectralInterpolator
+from model.Synthesizer import Synthesizer
+from model.WindowedSinc import WindowedSinc
 
 
 class Signal:
@@ -16,11 +25,32 @@ class Signal:
         SNR (float): The Signal-to-Noise Ratio.
         sampling_freq (int): The sampling frequency of the signal.
         sampling_factor (int): The sampling factor affecting the sampling frequency.
-        sampled_points (list): A list of (x, y) tuples for sampled points.
+        sampled_times (numpy.ndarray): The sampling instants of the last `sample_signal` call.
+        sampled_values (numpy.ndarray): The sampled values of the last `sample_signal` call.
+        sampled_points (list): The same samples as (time, value) pairs, built on access.
         recovered_points (list): A list of (x, y) tuples for recovered points.
-        noise_samples (list): A list of noise samples applied to the signal.
+        noise_seed (int): The seed of the noise realization, so noisy results can be reproduced.
+        noise (numpy.ndarray): The unit-variance noise realization, scaled to the SNR by `apply_noise`.
+        reconstruction_mode (str): The reconstruction engine, "windowed", "fft" or "exact".
+        interpolator (WindowedSinc): The kernel used by the windowed reconstruction.
+        spectral_interpolator (SpectralInterpolator): The engine used by the fft reconstruction.
+        sampler (Sampler): The backend that evaluates the signal at the sampling instants.
+        csv_cache (CsvCache): The binary cache used when reading recordings.
+        store (SignalStore): The multi-channel recording an uploaded signal is a view onto.
+        channel (str): The channel of the store the signal shows.
+        synthesizer (Synthesizer): The engine that sums the components on the time grid.
+        bank (ComponentBank): The components' amplitudes, frequencies and shifts, as arrays.
+        components (list): The components as Component objects, built from `bank` on access.
+        version (int): A number that changes whenever the signal's values change, unique across signals.
+        basis_cache (ResultCache): The interpolation operators reused while only the sampled values change.
+        duration (float): The length in seconds of the time grid of a synthesized signal.
+        oversampling (float): The grid rate of a synthesized signal as a multiple of its fmax.
     """
 
+    _versions = itertools.count(1)
+
+    RECONSTRUCTION_MODES = ("windowed", "fft", "exact")
+
     def __init__(self):
         """
         Initializes a Signal object with default values for its attributes.
@@ -32,42 +62,124 @@ class Signal:
         self.SNR = 0
         self.sampling_freq_given = 125
         self.sampling_factor = None
-        self.noise_samples = []
+        self.noise_seed = int(np.random.SeedSequence().entropy % 2**32)
         self.new_sampling_freq = 0
-        self.sampled_points = []
+        self.sampled_times = np.empty(0)
+        self.sampled_values = np.empty(0)
         self.recovered_points = []
-        self.components = []
         self.uploaded = False
         self.original_y = 0
         self.fmin = float("inf")
-        self.noise = []
+        self.noise = None
         self.original_y = None
-
-    def read_data_from_csv(self, file_path="data/bidmc_01_Signals.csv"):
+        self._signal_power = None
+        self._noisy_buffers = []
+        self.reconstruction_mode = "windowed"
+        self.interpolator = WindowedSinc()
+        self.spectral_interpolator = SpectralInterpolator()
+        self.sampler = Sampler()
+        self.csv_cache = CsvCache()
+        self.store = None
+        self.channel = None
+        self.synthesizer = Synthesizer()
+        self.bank = self.synthesizer.bank
+        self.version = next(self._versions)
+        self.duration = 20.0
+        self.oversampling = 10.0
+        self.basis_cache = ResultCache(64 << 20)
+
+    def read_data_from_csv(
+        self,
+        file_path="data/bidmc_01_Signals.csv",
+        offset=0,
+        length=1000,
+        start_time=None,
+        duration=None,
+        channel=" II",
+    ):
         """
         Read data from a CSV file and initialize signal attributes.
 
         Args:
             file_path (str): The path to the CSV file containing signal data.
+            offset (int): The first row of the window to read.
+            length (int): The number of rows to read, or None to read until the end of the file.
+            start_time (float): If given, the time (in seconds) at which the window starts, overriding offset.
+            duration (float): If given, the length of the window in seconds, overriding length.
+            channel (str): The column to show; the other columns stay available through `store`.
 
         Returns:
             None
 
-        This method reads the first 1000 rows of data from the specified CSV file
-        and initializes the signal attributes including time values (x), amplitude
+        Raises:
+            ValueError: If the window holds fewer than two rows, for example because
+                it starts past the end of the file.
+
+        This method reads a window of rows (by default the first 1000) from the specified
+        CSV file and initializes the signal attributes including time values (x), amplitude
         values (y), the number of data points (N), sampling frequency (sampling_freq),
         the maximum frequency (fmax), and the sampling factor (sampling_factor).
+        The first read of a file stores its parsed columns in `csv_cache`, and every
+        window is copied out of that memory-mapped cache, so later reads parse no text.
+        Every column is loaded once into a SignalStore, and x and y are views onto it.
         """
-        data = pd.read_csv(file_path).iloc[: self.N, :]
-        self.x = data["Time [s]"].to_numpy()
-        self.y = data[" II"].to_numpy()
-        self.N = 1000
-        self.sampling_freq_given = 125
-        self.fmax = 62
+        store = SignalStore(self.csv_cache)
+        store.read_csv(file_path, offset, length, start_time, duration)
+        self.load_from_store(store, channel)
+
+    def load_from_store(self, store: SignalStore, channel: str) -> None:
+        """
+        Makes the signal a zero-copy view onto one channel of a loaded store.
+
+        Args:
+            store (SignalStore): The multi-channel recording.
+            channel (str): The name of the channel to show.
+        """
+        self.store = store
+        self.x = store.time
+        self.N = len(self.x)
+        self.sampling_freq_given = store.sampling_freq
+        self.fmax = self.sampling_freq_given // 2
         self.sampling_factor = 1
-        self.new_sampling_freq = 125
+        self.new_sampling_freq = self.sampling_freq_given
         self.uploaded = True
-        self.original_y = self.y.copy()
+        self.select_channel(channel)
+
+    def select_channel(self, channel: str) -> None:
+        """
+        Switches the signal to another channel of its store without copying data
+        """
+        self.channel = channel
+        self.y = self.store.channel(channel)
+        self.original_y = self.y
+        self._signal_power = None
+        if self.SNR:
+            self.y = self.apply_noise(self.original_y)
+        self.version = next(self._versions)
+
+    @property
+    def y(self):
+        if self._noise_pending:
+            self._noise_pending = False
+            self._y = self.apply_noise(self.original_y)
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        self._noise_pending = False
+        self._y = value
+
+    def defer_snr(self, new_snr):
+        """
+        Sets the SNR like `change_snr`, but only adds the noise when `y` is next read,
+        so that a signal restored from memory-mapped arrays is not read from disk
+        until it is used
+        """
+        self.SNR = new_snr
+        if new_snr:
+            self._noise_pending = True
+        else:
+            self.y = self.original_y
 
     def change_snr(self, new_snr):
         """
@@ -83,11 +195,29 @@ class Signal:
         None
 
         This method updates the SNR attribute of the signal to the specified
-        new SNR value and creates noise samples accordingly.
+        new SNR value and rescales the signal's noise realization accordingly.
+        The clean values do not change, so `version` stays the same; results
+        depend on the SNR and `noise_seed` instead.
         """
         self.SNR = new_snr
         self.y = self.apply_noise(self.original_y)
 
+    def clear_noise(self):
+        """
+        Removes the noise, showing the clean values again
+        """
+        self.SNR = 0
+        self.y = self.original_y
+
+    def set_noise_seed(self, seed: int):
+        """
+        Draws a new noise realization from a seed, re-applying the noise if it is active
+        """
+        self.noise_seed = int(seed)
+        self.noise = None
+        if self.SNR:
+            self.y = self.apply_noise(self.original_y)
+
     def change_sampling_factor(self, new_sampling_factor):
         """
         Change the sampling factor of the signal.
@@ -129,56 +259,104 @@ class Signal:
 
     def create_noise(self, y):
         """
-        Create noise samples based on the current SNR.
+        Create the unit-variance noise realization for values like `y`.
 
         Returns
         -------
-        None
+        numpy.ndarray
+            The noise realization, drawn from `noise_seed`.
 
-        This method generates noise samples based on the current SNR and appends them to the noise_samples list.
+        The realization is drawn once per seed and signal length and reused by
+        every SNR, so the same seed always gives the same noisy signal.
         """
-        self.noise_samples.clear()
-        self.noise.clear()
-        temp_signal = self.y.copy()
-        signal_power = temp_signal**2
-        signal_average_power = np.mean(signal_power)
-        noise_power = signal_average_power / self.SNR
-        noise = np.random.normal(0, np.sqrt(noise_power), len(temp_signal))
-        self.noise_samples.append(noise)
-        noise = self.noise_samples.copy()
-        self.noise = noise.copy()
-        return noise
+        if self.noise is None or len(self.noise) != len(y):
+            self.noise = np.random.default_rng(self.noise_seed).standard_normal(len(y))
+        return self.noise
 
     def apply_noise(self, y):
         """
-        Apply noise samples to the signal.
+        Apply noise at the current SNR to the clean values `y`.
 
         Returns
         -------
         numpy.ndarray
             The noisy signal after applying noise.
 
-        This method applies the accumulated noise samples to the signal and returns the noisy signal.
+        The noise power is the average power of the clean values divided by the
+        SNR, so the unit realization is scaled by one scalar and added into one
+        of two preallocated buffers. The buffers alternate, so the values handed
+        to a background computation are only rewritten two SNR changes later,
+        by which time that computation has been superseded.
+        """
+        noise = self.create_noise(y)
+        if self._signal_power is None:
+            self._signal_power = np.mean(np.square(y))
+        scale = np.sqrt(self._signal_power / self.SNR)
+        if len(self._noisy_buffers) != 2 or len(self._noisy_buffers[0]) != len(y):
+            self._noisy_buffers = [np.empty(len(y)), np.empty(len(y))]
+        buffer = self._noisy_buffers[0]
+        if buffer is self.y:
+            buffer = self._noisy_buffers[1]
+        np.multiply(noise, scale, out=buffer)
+        buffer += y
+        return buffer
+
+    def get_impulse_train(self, sampling_freq=None):
         """
-        noisy = self.create_noise(y)
-        noisy_signal = y.copy()
-        for noise in noisy:
-            noisy_signal += noise
-        return noisy_signal
+        Returns the sampling instants x[0] + n / sampling_freq that fall before the last point of x.
 
-    def get_impulse_train(self):
-        if self.uploaded:
-            impulse_train = np.arange(0, self.x[-1], (1 / self.new_sampling_freq))
-        else:
-            impulse_train = np.arange(0, self.x[-1], 1 / (self.new_sampling_freq))
-        impulse_train = np.around(impulse_train, 3)
-        return impulse_train
+        Each instant is computed from its index rather than by accumulating a
+        step, so instants that coincide with grid points are exact and do not
+        drift over long signals.
+        """
+        if sampling_freq is None:
+            sampling_freq = self.new_sampling_freq
+        count = int(np.ceil((self.x[-1] - self.x[0]) * sampling_freq - 1e-9))
+        return self.x[0] + np.arange(max(count, 0)) / sampling_freq
+
+    def sample(self, sampling_freq=None, y=None):
+        """
+        Samples the signal without storing the result.
+
+        Parameters
+        ----------
+        sampling_freq : float, optional
+            The sampling frequency. Default is `new_sampling_freq`.
+        y : numpy.ndarray, optional
+            The values to sample. Default is the current `y`.
+
+        Returns
+        -------
+        tuple
+            The sampling instants and the sampled values.
+
+        Taking the frequency and values as arguments lets a background thread
+        sample a snapshot of the signal while the GUI keeps changing it.
+        """
+        if sampling_freq is None:
+            sampling_freq = self.new_sampling_freq
+        if y is None:
+            y = self.y
+        impulse_train = self.get_impulse_train(sampling_freq)
+        y_values_sampled = self.sampler.sample(
+            self.x, y, impulse_train, sampling_freq, self.sampling_freq_given
+        )
+        return impulse_train, y_values_sampled
 
     def sample_signal(self):
-        impulse_train = self.get_impulse_train()
-        y_values_sampled = np.zeros(len(impulse_train))
-        y_values_sampled = wsinterp(impulse_train, self.x, self.y)
-        self.sampled_points = list(zip(impulse_train, y_values_sampled))
+        """
+        Samples the signal at `new_sampling_freq` into `sampled_times` and `sampled_values`
+        """
+        self.sampled_times, self.sampled_values = self.sample()
+
+    @property
+    def sampled_points(self) -> list:
+        """
+        Returns the last samples as (time, value) pairs, so `zip(*sig.sampled_points)` keeps
+        working. Building the pairs boxes every sample; array code should use
+        `sampled_times` and `sampled_values` instead.
+        """
+        return list(zip(self.sampled_times.tolist(), self.sampled_values.tolist()))
 
     def whittaker_shannon_interpolation(self, x, y, x_new, T=1):
         """
@@ -212,21 +390,263 @@ class Signal:
 
         return y_new
 
+    def windowed_sinc_interpolation(self, x, y, x_new, T=1):
+        """
+        Perform truncated, windowed-sinc interpolation of uniformly spaced samples.
+
+        Takes the same arguments as `whittaker_shannon_interpolation`, but each
+        point of `x` only uses the `interpolator.half_width` samples on either side
+        of it, so the cost is O(len(x) * K) instead of O(len(x) * len(x_new)).
+        For samples of a sum of sinusoids taken at r times its Nyquist rate, the
+        error at points at least K samples inside the ends is at most the summed
+        amplitude times `self.interpolator.error_bound(r)`; see WindowedSinc.
+
+        Parameters:
+        x : array_like
+            The x-coordinates at which to evaluate the interpolated values.
+        y : array_like
+            The sample values.
+        x_new : array_like
+            The sampling instants of `y`.
+        T : float, optional
+            The sampling period. Default is 1.
+
+        Returns:
+        y_new : ndarray
+            The interpolated values at `x`.
+        """
+        return self.interpolator.interpolate(x_new, y, x, T)
+
+    def spectral_interpolation(self, x, y, x_new, T=1):
+        """
+        Perform FFT-based band-limited interpolation of uniformly spaced samples.
+
+        Takes the same arguments as `whittaker_shannon_interpolation`. The samples
+        are mirrored at the record edges, transformed once, and the spectrum is
+        evaluated on the uniform grid `x` with a chirp-z transform, costing
+        O((N + M) log(N + M)) for any ratio between T and the grid step.
+
+        Parameters:
+        x : array_like
+            The uniformly spaced x-coordinates at which to evaluate the interpolated values.
+        y : array_like
+            The sample values.
+        x_new : array_like
+            The sampling instants of `y`.
+        T : float, optional
+            The sampling period. Default is 1.
+
+        Returns:
+        y_new : ndarray
+            The interpolated values at `x`.
+        """
+        return self.spectral_interpolator.interpolate(x_new, y, x, T)
+
+    def set_reconstruction_mode(self, mode: str) -> None:
+        """
+        Selects the engine used by `reconstruct`
+        """
+        if mode not in self.RECONSTRUCTION_MODES:
+            raise ValueError(
+                f"reconstruction mode must be one of {self.RECONSTRUCTION_MODES}, got {mode!r}"
+            )
+        self.reconstruction_mode = mode
+
+    def reconstruct(self, x, y, x_new, T=1):
+        """
+        Reconstructs the samples `y` taken at `x_new` onto `x` using the selected mode.
+        The fft mode falls back to the windowed engine when `x` is not uniform.
+
+        The exact and windowed modes go through `interpolation_operator`, so
+        reconstructing new values at the same instants onto the same grid (an
+        SNR change, for example) is a single product with a cached operator.
+        """
+        if self.reconstruction_mode == "fft" and self.spectral_interpolator.is_uniform(x):
+            return self.spectral_interpolation(x, y, x_new, T)
+        operator = self.interpolation_operator(x, x_new, T)
+        if self.reconstruction_mode == "exact":
+            if operator is None:
+                return self.whittaker_shannon_interpolation(x, y, x_new, T)
+            return np.dot(y, operator)
+        if operator is None:
+            return self.windowed_sinc_interpolation(x, y, x_new, T)
+        return self.interpolator.apply(operator, y)
+
+    def interpolation_operator(self, x, x_new, T=1):
+        """
+        Returns the linear operator that reconstructs samples taken at `x_new` onto `x`.
+
+        In the exact mode it is the dense (len(x_new), len(x)) sinc matrix; in
+        the windowed mode it is the banded (index, weight) pair of
+        `WindowedSinc.operator`. Operators are kept in `basis_cache`, keyed by
+        digests of x and x_new, T and the kernel settings, and the least
+        recently used are evicted beyond its byte budget. Returns None when an
+        operator would not fit the budget, in which case the caller should
+        reconstruct directly.
+        """
+        x = np.asarray(x, dtype=float)
+        x_new = np.asarray(x_new, dtype=float)
+        if self.reconstruction_mode == "exact":
+            size = 8 * len(x) * len(x_new)
+            settings = ()
+        else:
+            size = 16 * len(x) * 2 * self.interpolator.half_width
+            settings = (
+                self.interpolator.half_width,
+                self.interpolator.window,
+                self.interpolator.beta,
+            )
+        if size > self.basis_cache.max_bytes:
+            return None
+        key = (
+            self.reconstruction_mode == "exact",
+            *settings,
+            self._digest(x),
+            self._digest(x_new),
+            float(T),
+        )
+        operator = self.basis_cache.get(key)
+        if operator is None:
+            if self.reconstruction_mode == "exact":
+                operator = (np.sinc((x - x_new[:, None]) / T),)
+            else:
+                operator = self.interpolator.operator(x_new, x, T)
+            self.basis_cache.put(key, operator)
+        return operator[0] if self.reconstruction_mode == "exact" else operator
+
+    @staticmethod
+    def _digest(array) -> bytes:
+        return hashlib.blake2b(np.ascontiguousarray(array).data, digest_size=16).digest()
+
     def add_component(self, component: Component) -> None:
         """
         Adds a component to the signal (adds a sinusoidal component to the signal)
         """
-        if self.fmax < component.frequency:
-            self.fmax = component.frequency
-        if self.fmin > component.frequency:
-            self.fmin = component.frequency
+        self.add_components([component])
+
+    def add_components(self, components: list) -> None:
+        """
+        Adds several components to the signal, synthesizing them in one batched pass
+        """
+        if len(components) == 0:
+            return
+        params = np.array([self._component_params(c) for c in components], dtype=float)
+        self.add_component_arrays(params[:, 0], params[:, 1], params[:, 2])
+
+    def add_component_arrays(self, amplitude, frequency, shift) -> None:
+        """
+        Adds components given as arrays of amplitudes, frequencies and shifts,
+        without creating a Component object per sinusoid
+        """
+        params = np.column_stack(
+            np.broadcast_arrays(
+                np.atleast_1d(amplitude), np.atleast_1d(frequency), np.atleast_1d(shift)
+            )
+        ).astype(float)
+        if len(params) == 0:
+            return
+        self._fit_grid(max(self.bank.max_frequency(), params[:, 1].max()))
+        self.synthesizer.add(params)
+        self._refresh_frequency_range()
         self.new_sampling_freq = 2 * self.fmax
-        self.x = np.arange(0, 20, 0.02)
-        self.y += component.amplitude * np.sin(
-            2 * np.pi * component.frequency * self.x + component.shift * np.pi
-        )
-        self.original_y = self.y.copy()
-        self.components.append(component)
+        self._refresh_y()
+
+    def remove_component(self, index) -> None:
+        """
+        Removes a component from the signal, or several given an index array
+        """
+        self.synthesizer.remove(index)
+        self._refresh_frequency_range()
+        self._refresh_y()
+
+    def update_components(self, indices, amplitude=None, frequency=None, shift=None) -> None:
+        """
+        Sets the amplitude, frequency and/or shift of several components in one pass
+        """
+        indices = np.atleast_1d(indices)
+        params = self.bank.params[indices].copy()
+        for column, values in enumerate((amplitude, frequency, shift)):
+            if values is not None:
+                params[:, column] = values
+        self._fit_grid(max(self.bank.max_frequency(), params[:, 1].max()))
+        self.synthesizer.update(indices, params)
+        self._refresh_frequency_range()
+        self._refresh_y()
+
+    def set_grid(self, duration: float = None, oversampling: float = None) -> None:
+        """
+        Sets the length and density of a synthesized signal's time grid.
+
+        Args:
+            duration (float): The length of the grid in seconds.
+            oversampling (float): The grid rate as a multiple of fmax, at least 2.
+
+        The grid rate is the smallest 5-smooth integer (2^a 3^b 5^c) at or
+        above oversampling * fmax, so memory and compute follow the signal's
+        bandwidth, and common sampling frequencies stay rational multiples of
+        the grid. Existing components are re-synthesized on the new grid.
+        """
+        if duration is not None:
+            if duration <= 0:
+                raise ValueError(f"duration must be positive, got {duration}")
+            self.duration = float(duration)
+        if oversampling is not None:
+            if oversampling < 2:
+                raise ValueError(f"oversampling must be at least 2, got {oversampling}")
+            self.oversampling = float(oversampling)
+        if len(self.bank):
+            self._fit_grid(self.bank.max_frequency(), force=True)
+            self._refresh_y()
+
+    def grid_rate(self, fmax: float) -> int:
+        """
+        Returns the grid rate used for a synthesized signal whose highest frequency is fmax
+        """
+        rate = max(int(np.ceil(self.oversampling * fmax - 1e-9)), 1)
+        while not self._is_smooth(rate):
+            rate += 1
+        return rate
+
+    def _fit_grid(self, fmax: float, force: bool = False) -> None:
+        """
+        Builds the time grid for fmax, or rebuilds it if it is too coarse for fmax.
+        The grid is never made coarser here, so removing a component does not re-synthesize.
+        """
+        rate = self.grid_rate(fmax)
+        if not force and self.x is not None and rate <= self.sampling_freq_given:
+            return
+        self.sampling_freq_given = rate
+        self.x = np.arange(int(round(self.duration * rate))) / rate
+        self.N = len(self.x)
+        self.synthesizer.set_grid(self.x)
+
+    @staticmethod
+    def _is_smooth(number: int) -> bool:
+        for factor in (2, 3, 5):
+            while number % factor == 0:
+                number //= factor
+        return number == 1
+
+    def restore_components(self, x, params, y) -> None:
+        """
+        Restores a synthesized signal from its grid, component parameters and clean values,
+        without re-synthesizing it
+        """
+        self.x = x
+        self.N = len(x)
+        self.synthesizer.restore(x, params, y)
+        self._refresh_frequency_range()
+        self.original_y = y
+        self._signal_power = None
+        self.y = self.apply_noise(y) if self.SNR else y
+        self.version = next(self._versions)
+
+    @property
+    def components(self) -> list:
+        """
+        Returns a ComponentView per component, so changing one updates the signal
+        """
+        return [ComponentView(self, index) for index in range(len(self.bank))]
 
     def get_signal_components(self) -> list:
         """
@@ -244,16 +664,36 @@ class Signal:
         """
         Updates the frequency of a component
         """
-        self.components[index].change_frequency(new_frequency)
+        self.update_components(index, frequency=new_frequency)
 
     def update_component_amplitude(self, index: int, new_amplitude: float) -> None:
         """
         Updates the amplitude of a component
         """
-        self.components[index].change_amplitude(new_amplitude)
+        self.update_components(index, amplitude=new_amplitude)
 
     def update_component_shift(self, index: int, new_shift: float) -> None:
         """
         Updates the shift of a component
         """
-        self.components[index].change_shift(new_shift)
\ No newline at end of file
+        self.update_components(index, shift=new_shift)
+
+    def _refresh_frequency_range(self) -> None:
+        self.fmax = self.bank.max_frequency()
+        self.fmin = self.bank.min_frequency()
+
+    def _refresh_y(self) -> None:
+        """
+        Takes the synthesized sum as the clean signal, re-applying noise if it is active
+        """
+        self.original_y = self.synthesizer.y.copy()
+        self._signal_power = None
+        if self.SNR:
+            self.y = self.apply_noise(self.original_y)
+        else:
+            self.y = self.original_y.copy()
+        self.version = next(self._versions)
+
+    @staticmethod
+    def _component_params(component: Component) -> tuple:
+        return component.amplitude, component.frequency, component.shift
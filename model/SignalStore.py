@@ -0,0 +1,122 @@
+import numpy as np
+
+from model.CsvCache import CsvCache
+
+
+class SignalStore:
+    """
+    A columnar, multi-channel recording sharing one time axis.
+
+    Every channel of a recording window is loaded once into a single
+    contiguous (n_columns, n_rows) array. The signals of the individual
+    leads are read-only views onto its rows, so switching leads neither
+    re-reads the file nor copies data.
+
+    Attributes:
+        csv_cache (CsvCache): The cache used to read recordings.
+        file_path (str): The path of the loaded recording.
+        columns (list): The column names of the recording, in storage order.
+        channels (list): The names of the signal channels (every column except the time column).
+        data (numpy.ndarray): The (n_columns, n_rows) array holding every column.
+        time (numpy.ndarray): The uniform time axis shared by all channels.
+        sampling_freq (int): The sampling frequency of the recording.
+    """
+
+    def __init__(self, csv_cache: CsvCache = None) -> None:
+        self.csv_cache = csv_cache if csv_cache is not None else CsvCache()
+        self.file_path = None
+        self.columns = []
+        self.channels = []
+        self.data = None
+        self.time = None
+        self.sampling_freq = None
+        self._signals = {}
+
+    def read_csv(
+        self,
+        file_path: str,
+        offset: int = 0,
+        length: int = 1000,
+        start_time: float = None,
+        duration: float = None,
+        time_column: str = "Time [s]",
+    ) -> None:
+        """
+        Loads a window of every channel of a CSV recording.
+
+        Args:
+            file_path (str): The path to the CSV file.
+            offset (int): The first row of the window to read.
+            length (int): The number of rows to read, or None to read until the end of the file.
+            start_time (float): If given, the time (in seconds) at which the window starts, overriding offset.
+            duration (float): If given, the length of the window in seconds, overriding length.
+            time_column (str): The name of the time column.
+
+        The rate comes from the first two rows, and the time axis is rebuilt from
+        row numbers, because later time stamps in long recordings may be rounded.
+
+        Raises:
+            ValueError: If the window holds fewer than two rows, for example because it
+                starts past the end of the file.
+        """
+        columns, head = self.csv_cache.read_window(file_path, 0, 2)
+        time = head[columns.index(time_column)]
+        sampling_freq = int(round(1 / (time[1] - time[0])))
+        if start_time is not None:
+            offset = int(round((start_time - time[0]) * sampling_freq))
+        if duration is not None:
+            length = int(round(duration * sampling_freq))
+        columns, data = self.csv_cache.read_window(file_path, offset, length)
+        if data.shape[1] < 2:
+            raise ValueError(
+                f"the window at row {offset} of {file_path} holds {data.shape[1]} rows; "
+                "at least 2 are needed"
+            )
+        data.setflags(write=False)
+
+        self.file_path = file_path
+        self.columns = columns
+        self.channels = [c for c in columns if c != time_column]
+        self.data = data
+        self.sampling_freq = sampling_freq
+        self.time = time[0] + (max(0, offset) + np.arange(data.shape[1])) / sampling_freq
+        self.time.setflags(write=False)
+        self._signals = {}
+
+    def load_arrays(
+        self,
+        columns: list,
+        channels: list,
+        data,
+        time,
+        sampling_freq: int,
+        file_path: str = None,
+    ) -> None:
+        """
+        Uses already loaded (for example memory-mapped) arrays as the recording
+        """
+        self.file_path = file_path
+        self.columns = list(columns)
+        self.channels = list(channels)
+        self.data = data
+        self.time = time
+        self.sampling_freq = sampling_freq
+        self._signals = {}
+
+    def channel(self, name: str):
+        """
+        Returns a read-only view of a channel's samples
+        """
+        return self.data[self.columns.index(name)]
+
+    def signal(self, name: str):
+        """
+        Returns the Signal of a channel, backed by a view onto the store
+        """
+        if name not in self._signals:
+            from model.Signal import Signal
+
+            sig = Signal()
+            sig.load_from_store(self, name)
+            self._signals[name] = sig
+        return self._signals[name]
@@ -0,0 +1,95 @@
+import numpy as np
+
+
+class SpectralInterpolator:
+    """
+    An FFT-based band-limited interpolator for uniformly spaced samples.
+
+    The samples are extended with their mirror image so that the periodic
+    extension implied by the DFT has no jump at the record edges (avoiding
+    wrap-around ringing), transformed once with an FFT, and the resulting
+    trigonometric polynomial is evaluated on a uniform target grid with a
+    chirp-z transform. Because the chirp-z transform accepts any frequency
+    step, the ratio between the sampling period and the target grid step
+    does not need to be an integer. The total cost is O((N + M) log(N + M))
+    for N samples and M target points.
+
+    Attributes:
+        block_size (int): The minimum number of target points evaluated per chirp-z transform.
+        rtol (float): The relative tolerance used to decide that a grid is uniform.
+    """
+
+    def __init__(self, block_size: int = 4096, rtol: float = 1e-6) -> None:
+        self.block_size = block_size
+        self.rtol = rtol
+
+    def is_uniform(self, x) -> bool:
+        """
+        Checks whether the points of x are evenly spaced
+        """
+        x = np.asarray(x, dtype=float)
+        if len(x) < 3:
+            return True
+        step = (x[-1] - x[0]) / (len(x) - 1)
+        if step <= 0:
+            return False
+        return bool(np.max(np.abs(np.diff(x) - step)) <= self.rtol * step)
+
+    def interpolate(self, samples_x, samples_y, x_new, T):
+        """
+        Reconstructs the signal at `x_new` from samples spaced by T.
+
+        Parameters
+        ----------
+        samples_x : array_like
+            The sampling instants; only the first one is used, the rest are assumed to follow every T.
+        samples_y : array_like
+            The sample values.
+        x_new : array_like
+            A uniform grid of points at which to evaluate the reconstruction.
+        T : float
+            The sampling period.
+
+        Returns
+        -------
+        numpy.ndarray
+            The reconstructed values at `x_new`.
+        """
+        samples_y = np.asarray(samples_y, dtype=float)
+        x_new = np.asarray(x_new, dtype=float)
+        n, m = len(samples_y), len(x_new)
+        if n == 0 or m == 0:
+            return np.zeros(m)
+        if n == 1:
+            return np.full(m, samples_y[0])
+
+        # Whole-sample symmetric extension: y0 .. y[n-1] .. y1, period 2n - 2.
+        extended = np.concatenate([samples_y, samples_y[-2:0:-1]])
+        length = len(extended)
+        spectrum = np.fft.rfft(extended) / length
+        spectrum[1:] *= 2
+        if length % 2 == 0:
+            spectrum[-1] /= 2
+        k = np.arange(len(spectrum))
+
+        # Phase advance per target step, and of the first target point.
+        step = (x_new[-1] - x_new[0]) / (m - 1) if m > 1 else 0.0
+        delta = 2 * np.pi * step / (length * T)
+        theta0 = 2 * np.pi * (x_new[0] - samples_x[0]) / (length * T)
+
+        block = max(self.block_size, len(k))
+        nfft = 1 << int(np.ceil(np.log2(len(k) + block - 1)))
+        chirp = np.exp(-0.5j * delta * np.arange(-(len(k) - 1), block) ** 2)
+        chirp_fft = np.fft.fft(chirp, nfft)
+        k_chirp = np.exp(0.5j * delta * k**2)
+        m_chirp = np.exp(0.5j * delta * np.arange(block) ** 2)
+
+        y_new = np.empty(m)
+        for start in range(0, m, block):
+            count = min(block, m - start)
+            theta = np.mod(theta0 + start * delta, 2 * np.pi)
+            weighted = spectrum * np.exp(1j * theta * k) * k_chirp
+            conv = np.fft.ifft(np.fft.fft(weighted, nfft) * chirp_fft)
+            values = m_chirp[:count] * conv[len(k) - 1 : len(k) - 1 + count]
+            y_new[start : start + count] = values.real
+        return y_new
@@ -0,0 +1,142 @@
+import numpy as np
+
+from model.ComponentBank import ComponentBank
+
+
+class Synthesizer:
+    """
+    Evaluates the sum of sinusoidal components on a time grid.
+
+    All components added together are evaluated in one batched pass, as an
+    outer product of their frequencies with the time grid. Each component's
+    term is kept (while the terms fit in `budget_bytes`), so adding, editing
+    or removing a component only evaluates that component and adjusts the
+    running sum, instead of re-synthesizing the whole signal.
+
+    Attributes:
+        x (numpy.ndarray): The time grid.
+        y (numpy.ndarray): The sum of all component terms on the grid.
+        bank (ComponentBank): The amplitudes, frequencies and shifts of the components.
+        params (numpy.ndarray): An (n, 3) view of (amplitude, frequency, shift) per component.
+        terms (numpy.ndarray): The (n, len(x)) cached terms, or None once they exceed the budget.
+        budget_bytes (int): The largest size the cached terms may take.
+    """
+
+    def __init__(self, x=None, budget_bytes: int = 64 << 20, bank: ComponentBank = None) -> None:
+        self.budget_bytes = budget_bytes
+        self.bank = bank if bank is not None else ComponentBank()
+        self.x = None
+        self.y = None
+        self._terms = None
+        if x is not None:
+            self.set_grid(x)
+
+    @property
+    def params(self) -> np.ndarray:
+        return self.bank.params
+
+    @property
+    def terms(self):
+        if self._terms is None:
+            return None
+        return self._terms[: len(self.bank)]
+
+    def evaluate(self, params):
+        """
+        Evaluates the terms of an (n, 3) array of component parameters on the grid.
+
+        Returns
+        -------
+        numpy.ndarray
+            An (n, len(x)) array with one term per row.
+        """
+        params = np.atleast_2d(np.asarray(params, dtype=float))
+        amplitude, frequency, shift = params[:, 0:1], params[:, 1:2], params[:, 2:3]
+        return amplitude * np.sin(2 * np.pi * frequency * self.x + shift * np.pi)
+
+    def set_grid(self, x) -> None:
+        """
+        Moves the synthesizer to a new time grid, re-evaluating every component
+        """
+        self.x = np.asarray(x, dtype=float)
+        count = len(self.bank)
+        if self._fits(count):
+            self._terms = np.empty((max(count, 16), len(self.x)))
+            self._terms[:count] = self.evaluate(self.params)
+            self.y = self._terms[:count].sum(axis=0)
+        else:
+            self._terms = None
+            self.y = self.bank.evaluate(self.x)
+
+    def restore(self, x, params, y) -> None:
+        """
+        Takes a grid, component parameters and their already synthesized sum as they are.
+
+        Nothing is evaluated: the terms are not cached, and y is only copied
+        when a later edit changes it, so a memory-mapped y stays on disk
+        until then.
+        """
+        self.x = np.asarray(x, dtype=float)
+        self.bank.clear()
+        self.bank.add_params(params)
+        self._terms = None
+        self.y = y
+
+    def add(self, params) -> None:
+        """
+        Adds components given as an (n, 3) array of (amplitude, frequency, shift)
+        """
+        params = np.atleast_2d(np.asarray(params, dtype=float)).reshape(-1, 3)
+        start = len(self.bank)
+        self.bank.add_params(params)
+        if self._terms is not None and not self._fits(len(self.bank)):
+            self._terms = None
+        self._make_writable()
+        if self._terms is None:
+            self.y += self.bank.evaluate(self.x, start)
+            return
+        if len(self.bank) > len(self._terms):
+            terms = np.empty((max(len(self.bank), 2 * len(self._terms)), len(self.x)))
+            terms[:start] = self._terms[:start]
+            self._terms = terms
+        self._terms[start : len(self.bank)] = self.evaluate(params)
+        self.y += self._terms[start : len(self.bank)].sum(axis=0)
+
+    def update(self, index, params) -> None:
+        """
+        Replaces the (amplitude, frequency, shift) of one component, or of several given an index array
+        """
+        indices = np.atleast_1d(index)
+        params = np.atleast_2d(np.asarray(params, dtype=float)).reshape(-1, 3)
+        new_terms = self.evaluate(params)
+        self._make_writable()
+        self.y += new_terms.sum(axis=0) - self._term(indices).sum(axis=0)
+        self.bank.update(indices, params[:, 0], params[:, 1], params[:, 2])
+        if self._terms is not None:
+            self._terms[indices] = new_terms
+
+    def remove(self, index) -> None:
+        """
+        Removes one component, or several given an index array
+        """
+        indices = np.atleast_1d(index)
+        self._make_writable()
+        self.y -= self._term(indices).sum(axis=0)
+        if self._terms is not None:
+            keep = np.ones(len(self.bank), dtype=bool)
+            keep[indices] = False
+            kept = self._terms[: len(self.bank)][keep]
+            self._terms[: len(kept)] = kept
+        self.bank.remove(indices)
+
+    def _make_writable(self) -> None:
+        if not self.y.flags.writeable:
+            self.y = np.array(self.y)
+
+    def _fits(self, count: int) -> bool:
+        return 8 * count * len(self.x) <= self.budget_bytes
+
+    def _term(self, indices):
+        if self._terms is not None:
+            return self._terms[indices]
+        return self.evaluate(self.params[indices])
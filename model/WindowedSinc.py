@@ -0,0 +1,207 @@
+import numpy as np
+
+
+class WindowedSinc:
+    """
+    A truncated, windowed sinc kernel for band-limited interpolation.
+
+    Instead of summing the sinc contribution of every sample (an O(N*M)
+    matrix), each output point only uses the 2*half_width samples nearest
+    to it, weighted by sinc(u) * w(u / half_width) where w is a Lanczos or
+    Kaiser window. The cost becomes O(M*K) and the output is produced in
+    chunks, so memory stays bounded regardless of the signal length.
+
+    Error bound
+    -----------
+    Let the samples come from a sum of sinusoids with amplitudes A_i and
+    frequencies up to fmax, taken at fs = 2 * r * fmax (r >= 1 is the
+    oversampling). A tone of normalized frequency nu = f / fs is rebuilt by
+    the taps as sum_j h(u - j) exp(2j*pi*nu*j), against exp(2j*pi*nu*u) for
+    the ideal reconstruction, so at every output point at least K samples
+    away from both ends
+
+        |y(t) - y_windowed(t)| <= sum|A_i| * E(K, r)
+
+    where E(K, r) = max |1 - sum_j h(u - j) exp(-2j*pi*nu*(u - j))| over the
+    offset u and |nu| <= 1 / (2r), returned by `error_bound(r)`. With the
+    default K = 16 it is below 1e-3 for r >= 2 with the Lanczos window, and
+    below 1e-4 for r >= 1.25 with the Kaiser window.
+
+    The exact (dense) Whittaker-Shannon sum over the same N samples misses
+    the sinc tails of the samples beyond the ends. Summing those tails by
+    parts bounds its own deviation at an output point u samples after the
+    first sample by sum|A_i| / (pi * cos(pi / (2r))) * (1 / (u + 1) + 1 / (N - u)),
+    so the two paths differ by at most the sum of both bounds.
+
+    Attributes:
+        half_width (int): The number of samples used on each side of an output point (K).
+        window (str): The tapering window, either "lanczos" or "kaiser".
+        beta (float): The Kaiser window shape parameter.
+        chunk_size (int): The maximum number of kernel taps evaluated at once.
+    """
+
+    WINDOWS = ("lanczos", "kaiser")
+
+    def __init__(
+        self,
+        half_width: int = 16,
+        window: str = "lanczos",
+        beta: float = 8.6,
+        chunk_size: int = 1 << 20,
+    ) -> None:
+        if half_width < 1:
+            raise ValueError("half_width must be at least 1")
+        if window not in self.WINDOWS:
+            raise ValueError(f"window must be one of {self.WINDOWS}, got {window!r}")
+        self.half_width = int(half_width)
+        self.window = window
+        self.beta = beta
+        self.chunk_size = chunk_size
+
+    def taper(self, u):
+        """
+        Evaluates the window at u (in units of half_width), zero outside [-1, 1].
+        """
+        u = np.asarray(u, dtype=float)
+        inside = np.abs(u) < 1
+        if self.window == "lanczos":
+            w = np.sinc(u)
+        else:
+            w = np.i0(self.beta * np.sqrt(np.clip(1 - u**2, 0, None))) / np.i0(
+                self.beta
+            )
+        return np.where(inside, w, 0.0)
+
+    def kernel(self, u):
+        """
+        Evaluates the windowed sinc kernel at offsets u (in sampling periods).
+        """
+        u = np.asarray(u, dtype=float)
+        return np.sinc(u) * self.taper(u / self.half_width)
+
+    def interpolate(self, samples_x, samples_y, x_new, T):
+        """
+        Reconstructs the signal at `x_new` from uniformly spaced samples.
+
+        Parameters
+        ----------
+        samples_x : array_like
+            The sampling instants, spaced by (approximately) T.
+        samples_y : array_like
+            The sample values.
+        x_new : array_like
+            The points at which to evaluate the reconstruction.
+        T : float
+            The sampling period.
+
+        Returns
+        -------
+        numpy.ndarray
+            The reconstructed values at `x_new`.
+        """
+        samples_x = np.asarray(samples_x, dtype=float)
+        samples_y = np.asarray(samples_y, dtype=float)
+        x_new = np.asarray(x_new, dtype=float)
+        y_new = np.zeros(len(x_new))
+        if len(samples_x) == 0 or len(x_new) == 0:
+            return y_new
+
+        rows = max(1, self.chunk_size // (2 * self.half_width))
+        for start in range(0, len(x_new), rows):
+            index, weights = self._taps(samples_x, x_new[start : start + rows], T)
+            y_new[start : start + rows] = np.einsum("ij,ij->i", weights, samples_y[index])
+        return y_new
+
+    def operator(self, samples_x, x_new, T):
+        """
+        Returns the banded interpolation operator from the samples at `samples_x` to `x_new`.
+
+        Returns
+        -------
+        tuple
+            The (len(x_new), 2K) sample indices and weights of every output point,
+            so that `apply` gives the same values as `interpolate` for any samples_y.
+        """
+        samples_x = np.asarray(samples_x, dtype=float)
+        x_new = np.asarray(x_new, dtype=float)
+        if len(samples_x) == 0:
+            return np.zeros((len(x_new), 0), dtype=np.int64), np.zeros((len(x_new), 0))
+        return self._taps(samples_x, x_new, T)
+
+    @staticmethod
+    def apply(operator, samples_y):
+        """
+        Evaluates an operator from `operator` on the sample values samples_y
+        """
+        index, weights = operator
+        if index.shape[1] == 0:
+            return np.zeros(len(index))
+        return np.einsum("ij,ij->i", weights, np.asarray(samples_y, dtype=float)[index])
+
+    def _taps(self, samples_x, x_new, T):
+        taps = np.arange(-self.half_width + 1, self.half_width + 1)
+        n = len(samples_x)
+        # Nearest sample at or before each output point, assuming a uniform grid.
+        nearest = np.floor((x_new - samples_x[0]) / T).astype(np.int64)
+        index = nearest[:, None] + taps
+        valid = (index >= 0) & (index < n)
+        index = np.clip(index, 0, n - 1)
+        # Offsets use the actual sample instants so in-window terms match the exact sum.
+        weights = self.kernel((x_new[:, None] - samples_x[index]) / T)
+        weights[~valid] = 0.0
+        return index, weights
+
+    def error_bound(self, oversampling: float, points: int = 64, refinements: int = 4) -> float:
+        """
+        Returns E(K, r), the interior error per unit of summed amplitude for samples
+        taken at `oversampling` (r) times the Nyquist rate of the signal.
+
+        Parameters
+        ----------
+        oversampling : float
+            The ratio r = fs / (2 * fmax), at least 1.
+        points : int, optional
+            The number of offsets and of frequencies on the initial search grid.
+        refinements : int, optional
+            How many times the search is repeated on a finer grid around the largest errors.
+
+        Returns
+        -------
+        float
+            The bound E(K, r); multiply by the summed amplitude to get an absolute error bound.
+
+        The maximum is searched on a grid of offsets in [0, 1] and frequencies in
+        [0, 1 / (2r)] (the error is even in the frequency), and the grid is then
+        refined around its four largest values, each time to a quarter of the step.
+        """
+        if oversampling < 1:
+            raise ValueError(f"oversampling must be at least 1, got {oversampling}")
+        band = 0.5 / oversampling
+        u = np.linspace(0, 1, points + 1)
+        nu = np.linspace(0, band, points + 1)
+        du, dnu = u[1], nu[1]
+        error = self._tone_error(u[:, None], nu[None, :])
+        worst = float(error.max())
+        candidates = np.column_stack(np.unravel_index(np.argsort(error, axis=None)[-4:], error.shape))
+        centers = [(u[i], nu[k]) for i, k in candidates]
+        offsets = np.linspace(-1, 1, 9)
+        for _ in range(refinements):
+            refined = []
+            for center_u, center_nu in centers:
+                local_u = np.clip(center_u + du * offsets, 0, 1)
+                local_nu = np.clip(center_nu + dnu * offsets, 0, band)
+                error = self._tone_error(local_u[:, None], local_nu[None, :])
+                i, k = np.unravel_index(np.argmax(error), error.shape)
+                worst = max(worst, float(error[i, k]))
+                refined.append((local_u[i], local_nu[k]))
+            centers = refined
+            du, dnu = du / 4, dnu / 4
+        return worst
+
+    def _tone_error(self, u, nu):
+        """
+        Returns |1 - sum_j h(u - j) exp(-2j*pi*nu*(u - j))| over the taps of an interior point
+        """
+        v = u[..., None] - np.arange(-self.half_width + 1, self.half_width + 1)
+        response = np.sum(self.kernel(v) * np.exp(-2j * np.pi * nu[..., None] * v), axis=-1)
+        return np.abs(1 - response)